@@ -11,6 +11,14 @@ import os
 SCREEN_WIDTH = 480
 SCREEN_HEIGHT = 320
 FULLSCREEN = True  # Set to False for windowed mode (useful for testing on non-Pi systems)
+RENDER_BACKEND = 'software'  # 'software' (display surface), 'renderer' (SDL2 Renderer) or 'framebuffer'
+RENDERER_VSYNC = True  # Renderer backend only: present in step with the display refresh
+FRAMEBUFFER_DEVICE = '/dev/fb0'  # Framebuffer backend only: device (or plain file) frames are written to
+FRAMEBUFFER_BPP = None  # Framebuffer backend only: 16 (RGB565), 24 or 32; None reads it from the device
+TOUCH_DEVICE = '/dev/input/touchscreen'  # Framebuffer backend without a video driver: evdev touchscreen read directly
+TOUCH_SWAP_XY = False  # Touch axes swapped relative to the panel (rotated display)
+TOUCH_INVERT_X = False
+TOUCH_INVERT_Y = False
 
 # Colors (RGB)
 COLOR_BACKGROUND = (240, 248, 255)  # Alice Blue
@@ -25,19 +33,33 @@ COLOR_GUIDE_LINE = (200, 200, 200)  # Light Gray
 COLOR_USER_DRAWING = (70, 130, 180)  # Steel Blue
 COLOR_CORRECT = (50, 205, 50)  # Lime Green
 COLOR_INCORRECT = (255, 69, 0)  # Red Orange
+COLOR_DEMO_STROKE = (255, 165, 0)  # Orange
 
 # Touch Settings
 TOUCH_SENSITIVITY = 5  # Minimum distance between touch points
 TOUCH_DEADZONE = 10  # Ignore touches within this radius of buttons
 
 # Tracing Settings
-TRACING_TOLERANCE = 20  # Pixels - how close user needs to be to guide line
+TRACING_TOLERANCE = 20  # Pixels at 480x320 (scaled with the screen) - how close user needs to be to guide line
 TRACING_COMPLETION_THRESHOLD = 0.7  # 70% of path must be traced correctly
+GUIDE_SAMPLE_SPACING = TRACING_TOLERANCE // 2  # Pixels at 480x320 between resampled guide points used for point matching
+GUIDE_SIMPLIFY_TOLERANCE = 1.0  # Pixels - guide vertices closer than this to a straight run are dropped
+STROKE_ORDER_CHECK = True  # Score each stroke against the guide stroke expected in that order and direction
+STROKE_MATCH_SAMPLES = 16  # Points compared per stroke when checking order and direction
+STROKE_SIMILARITY_WINDOW = 0.2  # DTW band half-width as a fraction of the stroke's sample count
+ASYNC_SCORING = False  # Score on a background thread so long paths never stall the frame loop
+# Line widths and dashes in pixels at 480x320, scaled with the screen
 GUIDE_LINE_WIDTH = 3
 USER_LINE_WIDTH = 4
 DASH_LENGTH = 10
 DASH_GAP = 5
 
+# Stroke Order Demonstration ("Show me")
+DEMO_STROKE_SPEED = 150  # Pixels per second at 480x320 (scaled with the screen)
+DEMO_STROKE_PAUSE = 0.3  # Seconds between strokes
+DEMO_HOLD = 1.5  # Seconds the finished demonstration stays on screen
+DEMO_LINE_WIDTH = 6
+
 # UI Settings
 BUTTON_HEIGHT = 40  # Reduced for smaller screen
 BUTTON_PADDING = 10
@@ -45,15 +67,42 @@ FONT_SIZE_LARGE = 48  # Reduced for smaller screen
 FONT_SIZE_MEDIUM = 32
 FONT_SIZE_SMALL = 24
 CHARACTER_DISPLAY_SIZE = 180  # Reduced for 3.5" screen
-CHARACTER_GRID_COLS = 2  # 2x2 grid (4 characters visible at once)
-CHARACTER_GRID_ROWS = 2
+CHARACTER_GRID_COLS = None  # Columns in the character grid (None = as many as fit)
 CHARACTER_BUTTON_SIZE = 100  # Size of character buttons in grid
+SCROLL_DRAG_THRESHOLD = 8  # Pixels a touch must move before it scrolls instead of tapping
+SCROLL_FRICTION = 4.0  # Kinetic scroll decay rate (per second)
+SCROLL_MIN_VELOCITY = 20  # Pixels per second below which kinetic scrolling stops
 
 # Animation Settings
 ANIMATION_SPEED = 0.1
 CELEBRATION_DURATION = 2.0  # seconds
+PARTICLE_POOL_SIZE = 96  # Celebration particles alive at once
+
+# Sound Settings
+SOUND_ENABLED = True
+AUDIO_FREQUENCY = 22050  # Hz; clips are resampled to this once, when they are loaded
+AUDIO_BUFFER = 512  # Samples per mixer buffer; smaller starts sounds sooner (512 is ~23 ms)
+SOUND_VOLUME = 0.8  # 0.0-1.0
+PRONUNCIATION_CACHE_MB = 16  # Decoded pronunciation clips kept in memory (about 3 minutes of audio)
 
 # Paths
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), 'assets')
 FONTS_DIR = os.path.join(ASSETS_DIR, 'fonts')
 SOUNDS_DIR = os.path.join(ASSETS_DIR, 'sounds')
+STROKES_DIR = os.path.join(ASSETS_DIR, 'strokes')  # Stroke data generated from fonts by generate-strokes.py
+CACHE_DIR = os.path.join(os.path.dirname(__file__), 'cache')  # Generated data, safe to delete
+STARTUP_LOG = os.path.join(CACHE_DIR, 'startup.log')  # Time-to-first-frame history, one line per launch
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')  # Learner progress; keep when updating
+PROGRESS_DB = os.path.join(DATA_DIR, 'progress.db')
+STROKE_ARCHIVE = os.path.join(DATA_DIR, 'strokes.lpsa')  # Every attempt's touch points (src/stroke_archive.py)
+
+# Progress Settings
+PROGRESS_FLUSH_INTERVAL = 2.0  # Seconds attempts may wait before being written to disk
+PROGRESS_BATCH_SIZE = 32  # Attempts written at once when they arrive faster than that
+STROKE_ARCHIVE_SYNC_INTERVAL = 10.0  # Least seconds between fsyncs of the stroke archive
+
+# Practice Settings (SM-2 spaced repetition behind the Next button)
+PRACTICE_FIRST_INTERVAL = 24 * 3600  # Seconds until a character traced well is due again
+PRACTICE_SECOND_INTERVAL = 6 * 24 * 3600  # Seconds after the second good attempt in a row
+PRACTICE_RETRY_DELAY = 120  # Seconds until a failed character comes back
+PRACTICE_SLOW_SECONDS = 30  # Attempts taking longer than this count as harder
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Generate stroke data for a language from a font
+Each glyph is rasterized, thinned to its skeleton and traced into strokes
+(see src/glyph_strokes.py). The strokes are saved to
+assets/strokes/<language>.json, which the language module loads on top of
+its hand-written data. Glyphs are processed in parallel, one process per CPU.
+
+Stroke order and direction come from a heuristic, so check new characters
+in the app before shipping them. English looks characters up in upper case.
+
+Examples:
+    python3 generate-strokes.py assets/fonts/NotoSansKR-Regular.ttf korean --range AC00-AC1B
+    python3 generate-strokes.py assets/fonts/NotoSansSC-Regular.ttf chinese --chars 人大山水
+    python3 generate-strokes.py assets/fonts/MyFont.ttf english --existing
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from src.glyph_strokes import RASTER_SIZE, glyph_strokes, open_font
+from src.languages import LANGUAGE_IDS, get_language_module
+
+_font = None  # Font opened once in each worker process
+_size = RASTER_SIZE
+
+
+def _init_worker(font_path, size):
+    """Open the font in a worker process"""
+    global _font, _size
+    _font = open_font(font_path)
+    _size = size
+
+
+def _extract(char):
+    """Worker task: strokes for one character (None if the font has no glyph)"""
+    return char, glyph_strokes(_font, char, _size)
+
+
+def parse_ranges(ranges):
+    """Characters for code point ranges like 'AC00-AC1B' or '4E00'"""
+    chars = []
+    for text in ranges:
+        first, _, last = text.partition('-')
+        chars.extend(chr(code) for code in range(int(first, 16), int(last or first, 16) + 1))
+    return chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate stroke data for a language from a font')
+    parser.add_argument('font', help='TTF/OTF font file')
+    parser.add_argument('language', choices=LANGUAGE_IDS)
+    parser.add_argument('--chars', default='', help='characters to generate')
+    parser.add_argument('--range', action='append', default=[], dest='ranges',
+                        help='hex code point range to generate, e.g. AC00-AC1B (repeatable)')
+    parser.add_argument('--existing', action='store_true',
+                        help="regenerate every character the language already has")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--size', type=int, default=RASTER_SIZE, help='raster size in pixels per em')
+    args = parser.parse_args()
+    
+    chars = list(args.chars) + parse_ranges(args.ranges)
+    if args.existing:
+        chars += get_language_module(args.language).get_all_characters()
+    chars = list(dict.fromkeys(char for char in chars if not char.isspace()))
+    if not chars:
+        parser.error('no characters given (use --chars, --range or --existing)')
+    
+    path = os.path.join(config.STROKES_DIR, f'{args.language}.json')
+    generated = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            generated = json.load(f)
+    
+    start = time.monotonic()
+    missing = []
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                             initargs=(args.font, args.size)) as pool:
+        chunksize = max(1, len(chars) // (4 * (args.jobs or 1)))
+        for char, strokes in pool.map(_extract, chars, chunksize=chunksize):
+            if strokes is None:
+                missing.append(char)
+            else:
+                generated[char] = {'strokes': strokes}
+    
+    os.makedirs(config.STROKES_DIR, exist_ok=True)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(generated.items())), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, path)
+    
+    print(f"✅ {len(chars) - len(missing)} characters written to {path} "
+          f"in {time.monotonic() - start:.1f}s")
+    if missing:
+        print(f"⚠️  No glyph in the font for: {''.join(missing)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,34 +2,95 @@
 """
 Raspberry Pi Interactive Learning App
 Main entry point
+
+Screens (and NumPy, which only tracing needs) are imported when first shown,
+so a splash frame is on screen before the heavier modules load.
+
+With --supervise a long-lived parent imports everything and loads the stroke
+caches once, then runs each session in a forked child. When a session crashes
+or asks for a reset, the next child starts from the warm parent instead of a
+fresh interpreter.
 """
+import time
+_process_start = time.perf_counter()
+
+import argparse
+import os
+import signal
 import sys
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
 import pygame
+import config
 from src.display_manager import DisplayManager
+from src.layout import invalidate_layouts
 from src.touch_handler import TouchHandler
-from src.ui.menu_screen import MenuScreen
-from src.ui.tracing_screen import TracingScreen
+
+
+EXIT_RESTART = 75  # Session exit code asking the supervisor for a fresh session
+RESTART_KEY = pygame.K_F5
+CRASH_BACKOFF_MAX = 10.0  # Longest wait (seconds) before restarting a crashing session
+QUICK_CRASH_SECONDS = 2.0  # Sessions shorter than this count towards the backoff
+
+
+class StartupTimer:
+    """Records how long after process start each startup step finished"""
+    
+    def __init__(self, start):
+        self.start = start
+        self.marks = []  # List of (name, milliseconds since start)
+    
+    def mark(self, name):
+        """Record that a step has just finished"""
+        self.marks.append((name, (time.perf_counter() - self.start) * 1000))
+    
+    def report(self, verbose=False):
+        """Append the timings to the startup log and optionally print them"""
+        line = ' '.join(f"{name}={ms:.1f}" for name, ms in self.marks)
+        if verbose:
+            print(f"Startup (ms since launch): {line}")
+        try:
+            os.makedirs(os.path.dirname(config.STARTUP_LOG), exist_ok=True)
+            with open(config.STARTUP_LOG, 'a', encoding='utf-8') as f:
+                f.write(f"{time.strftime('%Y-%m-%dT%H:%M:%S')} {line}\n")
+        except OSError as e:
+            print(f"Could not write startup log: {e}")
 
 
 class LearningApp:
     """Main application class"""
     
-    def __init__(self):
+    def __init__(self, timer=None, report_timing=False):
         self.display_manager = DisplayManager()
         self.touch_handler = TouchHandler()
         self.screen = None
         self.current_screen = None
         self.running = True
         self.clock = pygame.time.Clock()
-        
+        self.timer = timer or StartupTimer(time.perf_counter())
+        self.report_timing = report_timing
+        self.exit_code = 0
+        self.sound_manager = None
+    
     def initialize(self):
         """Initialize the application"""
         self.screen = self.display_manager.initialize()
         if not self.screen:
             print("Failed to initialize display")
             return False
+        self.timer.mark('display')
+        
+        self.display_manager.show_splash()
+        self.timer.mark('splash')
+        
+        # Clips decode in the background; the first frame does not wait for them
+        from src.sound_manager import get_sound_manager
+        self.sound_manager = get_sound_manager()
+        self.sound_manager.initialize()
+        self.timer.mark('audio')
         
         # Start with menu screen
+        from src.ui.menu_screen import MenuScreen
+        self.timer.mark('menu_import')
         self.current_screen = MenuScreen(self.screen)
         return True
     
@@ -39,6 +100,7 @@ class LearningApp:
             return
         
         last_time = pygame.time.get_ticks()
+        first_frame = True
         
         while self.running:
             # Calculate delta time
@@ -52,11 +114,21 @@ class LearningApp:
                     self.running = False
                     break
                 
+                if event.type == pygame.VIDEORESIZE:
+                    self._handle_resize()
+                    continue
+                
+                if event.type == pygame.KEYDOWN and event.key == RESTART_KEY:
+                    # Start over with a clean session (see supervise())
+                    self.exit_code = EXIT_RESTART
+                    self.running = False
+                    break
+                
                 # Handle touch events
                 handled, touch_data = self.touch_handler.handle_event(event)
                 
-                # Pass to current screen
-                if isinstance(self.current_screen, TracingScreen) and handled:
+                # Pass to current screen (only the tracing screen draws)
+                if handled and hasattr(self.current_screen, 'handle_touch'):
                     self.current_screen.handle_touch(touch_data)
                 
                 # Handle other events
@@ -66,11 +138,17 @@ class LearningApp:
             
             # Update current screen
             self.current_screen.update(dt)
+            self.sound_manager.update()
             
             # Render
             self.current_screen.render()
             self.display_manager.update()
             
+            if first_frame:
+                first_frame = False
+                self.timer.mark('first_frame')
+                self.timer.report(self.report_timing)
+            
             # Limit frame rate
             self.clock.tick(60)
         
@@ -79,33 +157,187 @@ class LearningApp:
     def _handle_action(self, action):
         """Handle actions from screens"""
         if action == 'back_to_menu':
+            from src.ui.menu_screen import MenuScreen
             self.current_screen = MenuScreen(self.screen)
         
         elif isinstance(action, dict):
             if action.get('action') == 'start_tracing':
+                from src.ui.tracing_screen import TracingScreen
                 language = action.get('language')
                 character = action.get('character')
                 self.current_screen = TracingScreen(self.screen, language, character)
     
+    def _handle_resize(self):
+        """Recompute layouts and rebuild the current screen at the new size"""
+        from src.ui.menu_screen import MenuScreen
+        from src.ui.tracing_screen import TracingScreen
+        
+        self.screen = self.display_manager.handle_resize()
+        invalidate_layouts()
+        if isinstance(self.current_screen, TracingScreen):
+            self.current_screen = TracingScreen(
+                self.screen, self.current_screen.language, self.current_screen.character
+            )
+        else:
+            self.current_screen = MenuScreen(self.screen)
+    
     def cleanup(self):
-        """Clean up resources"""
+        """Clean up resources (saved progress is closed by run_session())"""
+        if self.sound_manager:
+            self.sound_manager.quit()
         self.display_manager.quit()
 
 
-def main():
-    """Entry point"""
+def _stop_session(signum, frame):
+    """SIGTERM/SIGHUP handler: end the frame loop so the session quits normally"""
     try:
-        app = LearningApp()
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+    except pygame.error:
+        raise SystemExit(0)  # The display is not open yet, so there is no loop to stop
+
+
+def run_session(timer, report_timing=False):
+    """
+    Run the app until it quits
+    Returns: process exit code (0 on quit, EXIT_RESTART on reset, 1 on error)
+    """
+    try:
+        app = LearningApp(timer, report_timing=report_timing)
         app.run()
+        return app.exit_code
     except KeyboardInterrupt:
         print("\nApplication interrupted by user")
+        return 0
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+        return 1
     finally:
+        # Save queued attempts even when the frame loop crashed
+        from src.progress_store import close_progress_store
+        from src.stroke_archive import close_stroke_archive
+        
+        close_progress_store()
+        close_stroke_archive()
         pygame.quit()
-        sys.exit(0)
+
+
+def preload():
+    """
+    Import every module and load the stroke caches a session will need
+    The display size is only known once a session opens it, so every size
+    already cached on disk is loaded; a size cached for the first time by a
+    session is read from disk by the sessions after it.
+    Nothing here opens the display, so the state is safe to share with forked children.
+    """
+    import numpy  # noqa: F401
+    from src.asset_cache import cached_sizes, get_guide_cache
+    from src.languages import LANGUAGE_IDS, get_language_module
+    import src.ui.menu_screen  # noqa: F401
+    import src.ui.tracing_screen  # noqa: F401
+    
+    for size in cached_sizes():
+        for language in LANGUAGE_IDS:
+            lang_module = get_language_module(language)
+            get_guide_cache(language, lang_module.CHARACTERS, size).preload()
+
+
+def _exit_code(status):
+    """Exit code of a child from its os.waitpid() status (negative signal number if killed)"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def supervise(report_timing=False):
+    """
+    Keep a warm parent process and run each session in a forked child
+    The child is replaced when it crashes or exits with EXIT_RESTART, and
+    on SIGHUP; SIGTERM/SIGINT stop the child and the supervisor.
+    Returns: exit code of the last session
+    """
+    preload()
+    print(f"Supervisor ready in {(time.perf_counter() - _process_start) * 1000:.0f} ms")
+    
+    state = {'child': None, 'stopping': False, 'restarting': False}
+    
+    def forward(signum, frame):
+        if signum == signal.SIGHUP:
+            state['restarting'] = True
+        else:
+            state['stopping'] = True
+        if state['child']:
+            try:
+                os.kill(state['child'], signal.SIGTERM)
+            except OSError:
+                pass
+    
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, forward)
+    
+    quick_crashes = 0
+    while True:
+        session_start = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            # Child: stop signals end the session through its normal cleanup
+            signal.signal(signal.SIGTERM, _stop_session)
+            signal.signal(signal.SIGHUP, _stop_session)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            timer = StartupTimer(session_start)
+            timer.mark('fork')
+            code = 1
+            try:
+                code = run_session(timer, report_timing)
+            finally:
+                sys.stdout.flush()
+                os._exit(code)
+        
+        state['child'] = pid
+        _, status = os.waitpid(pid, 0)
+        state['child'] = None
+        code = _exit_code(status)
+        
+        if state['stopping']:
+            return 0
+        if state['restarting']:
+            state['restarting'] = False
+            quick_crashes = 0
+            continue
+        if code == 0:
+            return 0
+        if code == EXIT_RESTART:
+            quick_crashes = 0
+            continue
+        
+        # Crashed: restart at once, backing off if it keeps failing right away
+        print(f"Session exited with code {code}, restarting")
+        if time.perf_counter() - session_start < QUICK_CRASH_SECONDS:
+            quick_crashes += 1
+            time.sleep(min(CRASH_BACKOFF_MAX, 0.5 * 2 ** (quick_crashes - 1)))
+        else:
+            quick_crashes = 0
+
+
+def main():
+    """Entry point"""
+    parser = argparse.ArgumentParser(description="Raspberry Pi Interactive Learning App")
+    parser.add_argument('--timing', action='store_true',
+                        help="print startup timings (they are always appended to the startup log)")
+    parser.add_argument('--supervise', action='store_true',
+                        help="keep a preloaded parent process and restart sessions from it")
+    args = parser.parse_args()
+    
+    if args.supervise:
+        if hasattr(os, 'fork'):
+            sys.exit(supervise(args.timing))
+        print("Supervisor mode needs os.fork(); running a single session")
+    
+    signal.signal(signal.SIGTERM, _stop_session)
+    timer = StartupTimer(_process_start)
+    timer.mark('imports')
+    sys.exit(run_session(timer, args.timing))
 
 
 if __name__ == "__main__":
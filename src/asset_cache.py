@@ -0,0 +1,249 @@
+"""
+Asset Cache - Display-size-specific data saved to disk so later starts skip rebuilding it
+
+Everything lives under config.CACHE_DIR in one folder per display key
+(screen resolution and CHARACTER_DISPLAY_SIZE). File names carry a hash of
+the language data and drawing settings, so edited characters or a new dash
+style never pick up stale files.
+
+Run `python3 -m src.asset_cache` to build the cache for the configured
+screen size ahead of time.
+"""
+import hashlib
+import json
+import os
+import zipfile
+import pygame
+import config
+
+
+CACHE_FORMAT_VERSION = 3  # Bump when the contents or layout of cached files change
+
+# Guide caches already opened, keyed by (language, size)
+_guide_caches = {}
+
+
+def display_key(size):
+    """Folder name for data that depends on the display size"""
+    width, height = size
+    return f"{width}x{height}_d{config.CHARACTER_DISPLAY_SIZE}"
+
+
+def cache_path(size, filename):
+    """Path of a cache file for a display size"""
+    return os.path.join(config.CACHE_DIR, display_key(size), filename)
+
+
+def cached_sizes():
+    """Display sizes that have a cache folder for the current CHARACTER_DISPLAY_SIZE"""
+    suffix = f"_d{config.CHARACTER_DISPLAY_SIZE}"
+    try:
+        names = os.listdir(config.CACHE_DIR)
+    except OSError:
+        return []
+    sizes = []
+    for name in sorted(names):
+        if not name.endswith(suffix):
+            continue
+        width, _, height = name[:-len(suffix)].partition('x')
+        if width.isdigit() and height.isdigit():
+            sizes.append((int(width), int(height)))
+    return sizes
+
+
+def data_version(characters):
+    """
+    Short hash of a language's stroke data and the settings used to draw it
+    characters: the language module's CHARACTERS dict
+    """
+    data = {
+        'format': CACHE_FORMAT_VERSION,
+        'strokes': {char: entry.get('strokes', []) for char, entry in sorted(characters.items())},
+        'guide': [config.GUIDE_LINE_WIDTH, config.DASH_LENGTH, config.DASH_GAP,
+                  list(config.COLOR_GUIDE_LINE)],
+    }
+    encoded = json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def _replace_file(path, write):
+    """Write a file through a temp file in the same folder, then swap it in"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    root, ext = os.path.splitext(path)
+    temp_path = f"{root}.tmp{ext}"
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+class GuideCache:
+    """Pre-scaled strokes and guide layer images for one language at one display size"""
+    
+    def __init__(self, language, characters, size):
+        """
+        language: language id; characters: the language module's CHARACTERS dict
+        size: screen (width, height) the strokes are fitted to
+        """
+        self.language = language
+        self.characters = characters
+        self.size = tuple(size)
+        self.version = data_version(characters)
+        self.strokes_path = cache_path(self.size, f"{language}_strokes_{self.version}.npz")
+        self.strokes = None  # Character -> list of (N, 2) arrays, once loaded from an existing archive
+        self.layers = {}  # Character -> guide layer surface
+    
+    def _layer_path(self, char):
+        """Guide layer image path; code points keep file names ASCII"""
+        code = '-'.join(f"{ord(c):x}" for c in char)
+        return cache_path(self.size, f"{self.language}_guide_{self.version}_{code}.png")
+    
+    def get_strokes(self, char):
+        """Get the screen-space strokes for a character, or None if not cached"""
+        if self.strokes is None:
+            # Not loaded yet, or there was no archive: another process may have written it since
+            self.strokes = self._load_strokes()
+            if self.strokes is None:
+                return None
+        return self.strokes.get(char)
+    
+    def preload(self):
+        """Read the stroke archive now instead of on the first lookup (no-op if there is none yet)"""
+        if self.strokes is None:
+            self.strokes = self._load_strokes()
+    
+    def _load_strokes(self):
+        """
+        Read the language's stroke archive
+        Returns: dict of strokes, or None if the file is missing or damaged
+        """
+        import numpy as np  # Deferred so the menu can start without NumPy loaded
+        
+        try:
+            with np.load(self.strokes_path, allow_pickle=False) as data:
+                strokes = {}
+                for i, char in enumerate(data['characters'].tolist()):
+                    points = data[f'points_{i}']
+                    bounds = np.cumsum(data[f'lengths_{i}'])[:-1]
+                    strokes[char] = np.split(points, bounds)
+                return strokes
+        except (zipfile.BadZipFile, EOFError, KeyError, ValueError) as e:
+            # Truncated or damaged, e.g. by a power cut while it was written:
+            # remove it so the strokes are fitted and stored again
+            print(f"Could not read cached guide strokes, rebuilding: {e}")
+            try:
+                os.remove(self.strokes_path)
+            except OSError:
+                pass
+            return None
+        except OSError:
+            return None
+    
+    def store_strokes(self, strokes):
+        """
+        Save screen-space strokes for every character of the language
+        strokes: dict mapping character -> list of strokes
+        """
+        import numpy as np
+        
+        arrays = {'characters': np.array(list(strokes.keys()))}
+        for i, char_strokes in enumerate(strokes.values()):
+            parts = [np.asarray(stroke, dtype=float).reshape(-1, 2) for stroke in char_strokes]
+            arrays[f'points_{i}'] = np.vstack(parts) if parts else np.empty((0, 2))
+            arrays[f'lengths_{i}'] = np.array([len(part) for part in parts], dtype=np.int32)
+        
+        def write(path):
+            with open(path, 'wb') as f:
+                np.savez(f, **arrays)
+        
+        try:
+            _replace_file(self.strokes_path, write)
+        except OSError as e:
+            print(f"Could not cache guide strokes: {e}")
+        self.strokes = {char: [np.asarray(s, dtype=float) for s in value] for char, value in strokes.items()}
+    
+    def get_layer(self, char):
+        """Get the guide layer for a character, or None if not cached"""
+        if char in self.layers:
+            return self.layers[char]
+        try:
+            layer = pygame.image.load(self._layer_path(char))
+        except (OSError, pygame.error):
+            return None
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert_alpha()
+        self.layers[char] = layer
+        return layer
+    
+    def store_layer(self, char, layer):
+        """Save a character's guide layer image"""
+        self.layers[char] = layer
+        try:
+            _replace_file(self._layer_path(char), lambda path: pygame.image.save(layer, path))
+        except (OSError, pygame.error) as e:
+            print(f"Could not cache guide layer: {e}")
+
+
+def get_guide_cache(language, characters, size):
+    """Get the guide cache for a language at a display size"""
+    key = (language, tuple(size))
+    cache = _guide_caches.get(key)
+    if cache is None:
+        cache = GuideCache(language, characters, size)
+        _guide_caches[key] = cache
+    return cache
+
+
+def load_engine(screen, language, lang_module, char):
+    """
+    Create a TracingEngine for a character, using and filling the asset cache
+    Returns: TracingEngine, or None if the character does not exist
+    """
+    from src.layout import get_layout
+    from src.tracing_engine import TracingEngine, fit_strokes
+    
+    character_data = lang_module.get_character(char)
+    if not character_data:
+        return None
+    # Look up the stored entry by its own name so case-folded lookups share it
+    key = character_data.get('name', char)
+    
+    size = screen.get_size()
+    cache = get_guide_cache(language, lang_module.CHARACTERS, size)
+    scaled_strokes = cache.get_strokes(key)
+    if scaled_strokes is None:
+        # Fit the whole language at once so later characters load from disk
+        layout = get_layout(size)
+        cache.store_strokes({
+            name: fit_strokes(entry['strokes'], layout.character_area, layout.px(10))
+            for name, entry in lang_module.CHARACTERS.items()
+        })
+        scaled_strokes = cache.get_strokes(key)
+    
+    guide_layer = cache.get_layer(key)
+    engine = TracingEngine(screen, character_data, scaled_strokes, guide_layer)
+    if guide_layer is None:
+        cache.store_layer(key, engine.guide_layer)
+    return engine
+
+
+def build_all(screen):
+    """Fill the cache for every language at the screen's size"""
+    from src.layout import get_layout
+    from src.languages import LANGUAGE_IDS, get_language_module
+    from src.ui.glyph_atlas import get_glyph_atlas
+    
+    layout = get_layout(screen.get_size())
+    for language in LANGUAGE_IDS:
+        lang_module = get_language_module(language)
+        characters = lang_module.get_all_characters()
+        for char in characters:
+            load_engine(screen, language, lang_module, char)
+        get_glyph_atlas(language, characters, layout.character_button_size - 20, size=screen.get_size())
+        print(f"Cached {language}: {len(characters)} characters")
+
+
+if __name__ == "__main__":
+    # Build without opening a window
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    build_all(pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)))
+    pygame.quit()
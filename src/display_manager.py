@@ -1,5 +1,17 @@
 """
 Display Manager - Handles Pygame display initialization for Raspberry Pi LCD
+
+Backends that put frames on screen (config.RENDER_BACKEND):
+- 'software': screens draw straight onto the pygame.display surface
+- 'renderer': screens draw onto an off-screen surface, which is uploaded to a
+  streaming SDL texture each frame; the SDL Renderer scales and presents it,
+  on the GPU where a hardware driver is available. If the renderer cannot be
+  created the software backend is used instead.
+- 'framebuffer': screens draw onto an off-screen surface whose changed rows
+  are copied into config.FRAMEBUFFER_DEVICE (see src/framebuffer.py), for
+  images without X. Falls back to software if the device cannot be opened.
+  Without a video driver SDL runs headless and has no input, so touches are
+  read from config.TOUCH_DEVICE instead (see src/touch_input.py).
 """
 import pygame
 import os
@@ -14,31 +26,59 @@ class DisplayManager:
         self.width = config.SCREEN_WIDTH
         self.height = config.SCREEN_HEIGHT
         self.fullscreen = config.FULLSCREEN
-        
+        self.backend = 'software'
+        self.window = None  # Renderer backend only
+        self.renderer = None
+        self.frame_texture = None
+        self.framebuffer = None  # Framebuffer backend only
+        self.headless = False  # SDL runs with the dummy video driver (framebuffer backend only)
+        self.touch_input = None  # EvdevTouch when headless
+    
     def initialize(self):
         """Initialize Pygame and create the display surface"""
-        # Initialize Pygame
-        pygame.init()
-        
         # Set environment variables for Raspberry Pi (if needed)
-        # Some LCD displays require specific framebuffer settings
+        # Some LCD displays require specific framebuffer settings; SDL only
+        # reads them when the video subsystem starts
         if os.name != 'nt':  # Not Windows
             # Try to use framebuffer if available
             os.environ['SDL_FBDEV'] = '/dev/fb0'
             os.environ['SDL_MOUSEDEV'] = '/dev/input/touchscreen'
             os.environ['SDL_MOUSEDRV'] = 'TSLIB'
         
+        # Start only the subsystems the app uses (pygame.init() would also
+        # open audio, joystick and camera support)
+        try:
+            pygame.display.init()
+        except pygame.error:
+            if config.RENDER_BACKEND != 'framebuffer':
+                raise
+            # No video driver (e.g. no X); SDL is only needed for its event queue
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            pygame.display.init()
+            self.headless = True
+        pygame.font.init()
+        
         # Hide mouse cursor for touchscreen
         pygame.mouse.set_visible(False)
         
         # Create display
+        if config.RENDER_BACKEND == 'renderer' and self._init_renderer():
+            return self.screen
+        if config.RENDER_BACKEND == 'framebuffer' and self._init_framebuffer():
+            return self.screen
+        if self.headless:
+            # The software backend needs a real video driver
+            print("No video driver: the framebuffer backend needs FRAMEBUFFER_DEVICE and TOUCH_DEVICE")
+            return None
+        
         if self.fullscreen:
             self.screen = pygame.display.set_mode(
                 (self.width, self.height),
                 pygame.FULLSCREEN
             )
         else:
-            self.screen = pygame.display.set_mode((self.width, self.height))
+            # Resizable so layouts can be checked at other panel sizes
+            self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
         
         pygame.display.set_caption("Learning App")
         
@@ -47,6 +87,102 @@ class DisplayManager:
         
         return self.screen
     
+    def _init_renderer(self):
+        """
+        Open the window through pygame._sdl2 and draw frames with an SDL Renderer
+        Returns: True on success, False to fall back to the software backend
+        """
+        try:
+            from pygame._sdl2.video import Window, Renderer
+            
+            self.window = Window("Learning App", size=(self.width, self.height),
+                                 fullscreen_desktop=self.fullscreen,
+                                 resizable=not self.fullscreen)
+            self.renderer = Renderer(self.window, vsync=config.RENDERER_VSYNC)
+            self._create_frame()
+        except (ImportError, pygame.error) as e:
+            print(f"Could not start the renderer backend, using software: {e}")
+            if self.window is not None:
+                self.window.destroy()
+            self.window = self.renderer = self.frame_texture = None
+            return False
+        
+        self.backend = 'renderer'
+        self.clock = pygame.time.Clock()
+        return True
+    
+    def _init_framebuffer(self):
+        """
+        Draw frames off-screen and copy them into the framebuffer device
+        Returns: True on success, False to fall back to the software backend
+        """
+        from src.framebuffer import Framebuffer
+        
+        try:
+            self.framebuffer = Framebuffer(config.FRAMEBUFFER_DEVICE, (self.width, self.height),
+                                           config.FRAMEBUFFER_BPP)
+        except (OSError, ValueError) as e:
+            fallback = "" if self.headless else ", using software"
+            print(f"Could not open framebuffer {config.FRAMEBUFFER_DEVICE}{fallback}: {e}")
+            return False
+        
+        if self.headless and not self._init_touch_input():
+            self.framebuffer.close()
+            self.framebuffer = None
+            return False
+        
+        self.screen = pygame.Surface((self.width, self.height))
+        self.backend = 'framebuffer'
+        self.clock = pygame.time.Clock()
+        return True
+    
+    def _init_touch_input(self):
+        """
+        Read touches from config.TOUCH_DEVICE, since headless SDL reports none
+        Returns: False if the device cannot be opened (the app could not be used)
+        """
+        from src.touch_input import EvdevTouch
+        
+        try:
+            self.touch_input = EvdevTouch(config.TOUCH_DEVICE, (self.width, self.height),
+                                          config.TOUCH_SWAP_XY, config.TOUCH_INVERT_X, config.TOUCH_INVERT_Y)
+        except OSError as e:
+            print(f"Could not open touchscreen {config.TOUCH_DEVICE} (set TOUCH_DEVICE to its "
+                  f"/dev/input/event* device): {e}")
+            return False
+        return True
+    
+    def _create_frame(self):
+        """Create the off-screen frame surface and the texture it is uploaded to"""
+        from pygame._sdl2.video import Texture
+        
+        self.screen = pygame.Surface((self.width, self.height))
+        self.frame_texture = Texture(self.renderer, (self.width, self.height), streaming=True)
+        # Frames keep their pixel size; SDL letterboxes them into the window
+        self.renderer.logical_size = (self.width, self.height)
+    
+    def _present(self):
+        """Show the frame that was just drawn"""
+        if self.backend == 'renderer':
+            self.frame_texture.update(self.screen)
+            self.renderer.draw_color = (0, 0, 0, 255)
+            self.renderer.clear()
+            self.frame_texture.draw()
+            self.renderer.present()
+        elif self.backend == 'framebuffer':
+            self.framebuffer.write(self.screen)
+        else:
+            pygame.display.flip()
+    
+    def show_splash(self, text="Loading..."):
+        """Paint a simple frame right away while the rest of the app loads"""
+        self.screen.fill(config.COLOR_BACKGROUND)
+        font = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
+        text_surface = font.render(text, True, config.COLOR_TEXT)
+        text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2))
+        self.screen.blit(text_surface, text_rect)
+        self._present()
+    
     def get_screen(self):
         """Get the display surface"""
         return self.screen
@@ -55,11 +191,29 @@ class DisplayManager:
         """Get screen dimensions"""
         return (self.width, self.height)
     
+    def handle_resize(self):
+        """Pick up the new display surface after the window was resized"""
+        if self.backend == 'renderer':
+            self.width, self.height = self.window.size
+            self._create_frame()
+            return self.screen
+        self.screen = pygame.display.get_surface()
+        self.width, self.height = self.screen.get_size()
+        return self.screen
+    
     def update(self):
         """Update the display"""
-        pygame.display.flip()
+        self._present()
+        if self.touch_input is not None:
+            self.touch_input.poll()  # Delivered by the next pygame.event.get()
         self.clock.tick(60)  # Target 60 FPS
     
     def quit(self):
         """Clean up and quit Pygame"""
+        if self.framebuffer is not None:
+            self.framebuffer.close()
+            self.framebuffer = None
+        if self.touch_input is not None:
+            self.touch_input.close()
+            self.touch_input = None
         pygame.quit()
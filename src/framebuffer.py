@@ -0,0 +1,148 @@
+"""
+Framebuffer - Copies frames straight into a memory-mapped Linux framebuffer
+
+Used by the 'framebuffer' display backend on images without X: screens draw
+on an off-screen surface, and each frame is converted to the panel's pixel
+format with NumPy and written into /dev/fbN. Only rows that changed since the
+previous frame are written. The visible buffer is written in place, with no
+page flip (SPI panel drivers cannot pan), so a frame can tear while it is
+copied. A plain file can stand in for the device.
+"""
+import mmap
+import os
+import stat
+import numpy as np
+import pygame
+
+
+# Bits per pixel -> (per-pixel shape suffix, dtype) of a converted frame
+PIXEL_FORMATS = {
+    16: ((), np.dtype('<u2')),  # RGB565, as used by most SPI panels
+    24: ((3,), np.dtype(np.uint8)),  # BGR
+    32: ((4,), np.dtype(np.uint8)),  # BGRX
+}
+
+
+def read_geometry(path):
+    """
+    Read a framebuffer device's geometry from sysfs
+    Returns: (width, height, bits_per_pixel, stride), or None if it is not a
+    framebuffer device (e.g. a plain file)
+    """
+    name = os.path.basename(os.path.realpath(path))
+    sysfs = os.path.join('/sys/class/graphics', name)
+    try:
+        with open(os.path.join(sysfs, 'virtual_size')) as f:
+            width, height = (int(value) for value in f.read().strip().split(','))
+        with open(os.path.join(sysfs, 'bits_per_pixel')) as f:
+            bits_per_pixel = int(f.read())
+        with open(os.path.join(sysfs, 'stride')) as f:
+            stride = int(f.read())
+    except (OSError, ValueError):
+        return None
+    return width, height, bits_per_pixel, stride
+
+
+def convert_pixels(rgb, out):
+    """
+    Convert RGB pixels to a framebuffer pixel format
+    rgb: (height, width, 3) uint8 array
+    out: array from PIXEL_FORMATS to fill; its shape picks the format
+    """
+    if out.ndim == 2:
+        # RGB565: 5 bits red, 6 bits green, 5 bits blue
+        out[:] = rgb[..., 0] >> 3
+        out <<= 6
+        out |= rgb[..., 1] >> 2
+        out <<= 5
+        out |= rgb[..., 2] >> 3
+    else:
+        out[..., 0] = rgb[..., 2]
+        out[..., 1] = rgb[..., 1]
+        out[..., 2] = rgb[..., 0]
+        if out.shape[-1] == 4:
+            out[..., 3] = 255
+
+
+class Framebuffer:
+    """A memory-mapped framebuffer that frames are copied into"""
+    
+    def __init__(self, path, size, bits_per_pixel=None):
+        """
+        path: framebuffer device, or a plain file standing in for one
+        size: (width, height) of the frames that will be written
+        bits_per_pixel: 16 (RGB565), 24 (BGR) or 32 (BGRX); None reads it from
+        sysfs, or uses 16 for a plain file
+        Raises OSError if the file cannot be mapped, ValueError for an unsupported format
+        """
+        geometry = read_geometry(path)
+        if geometry:
+            fb_width, fb_height, fb_bits, stride = geometry
+        else:
+            (fb_width, fb_height), fb_bits, stride = size, 16, None
+        self.bits_per_pixel = bits_per_pixel or fb_bits
+        if self.bits_per_pixel not in PIXEL_FORMATS:
+            raise ValueError(f"Unsupported framebuffer format: {self.bits_per_pixel} bits per pixel")
+        pixel_shape, dtype = PIXEL_FORMATS[self.bits_per_pixel]
+        bytes_per_pixel = self.bits_per_pixel // 8
+        stride = stride or fb_width * bytes_per_pixel
+        
+        # Frames larger than the framebuffer are clipped at the right and bottom
+        self.width = min(size[0], fb_width)
+        self.height = min(size[1], fb_height)
+        
+        length = stride * fb_height
+        self.file = open(path, 'r+b')
+        try:
+            if stat.S_ISREG(os.fstat(self.file.fileno()).st_mode):
+                if os.fstat(self.file.fileno()).st_size < length:
+                    self.file.truncate(length)
+            self.map = mmap.mmap(self.file.fileno(), length)
+        except (OSError, ValueError):
+            self.file.close()
+            raise
+        rows = np.frombuffer(self.map, dtype=np.uint8, count=length).reshape(fb_height, stride)
+        self.rows = rows[:self.height, :self.width * bytes_per_pixel]
+        
+        # Converted copies of the frame last written and the one being written,
+        # compared row by row
+        shape = (self.height, self.width) + pixel_shape
+        self.shown = np.zeros(shape, dtype=dtype)
+        self.frame = np.zeros(shape, dtype=dtype)
+        self.shown_valid = False  # The first frame is written in full
+    
+    def write(self, surface):
+        """
+        Copy a frame into the framebuffer, touching only the rows that changed
+        surface: 24 or 32-bit surface at least as large as the framebuffer area
+        Returns: number of rows written
+        """
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            convert_pixels(pixels[:self.width, :self.height].transpose(1, 0, 2), self.frame)
+        finally:
+            del pixels  # Unlock the surface
+        
+        if self.shown_valid:
+            changed = (self.frame != self.shown).reshape(self.height, -1).any(axis=1)
+        else:
+            changed = np.ones(self.height, dtype=bool)
+        
+        # Copy each run of consecutive changed rows in one slice assignment
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], changed.astype(np.int8), [0]))))
+        data = self.frame.view(np.uint8).reshape(self.height, -1)
+        for start, end in zip(edges[::2], edges[1::2]):
+            self.rows[start:end] = data[start:end]
+        
+        self.shown, self.frame = self.frame, self.shown
+        self.shown_valid = True
+        return int(changed.sum())
+    
+    def close(self):
+        """Unmap and close the framebuffer"""
+        if self.map is None:
+            return
+        self.rows = None  # Release the view before unmapping
+        self.map.close()
+        self.file.close()
+        self.map = None
@@ -0,0 +1,313 @@
+"""
+Glyph Strokes - Turns font glyphs into stroke polylines for the character data
+
+Each glyph is rasterized, thinned to a one-pixel skeleton (Zhang-Suen) and
+the skeleton is traced into polylines between its end and junction points.
+Pieces that continue straight through a junction are joined into one stroke,
+short spurs are dropped, and the strokes are ordered and directed the way
+they are usually written (top to bottom, left to right) and scaled to the
+0-100 box used by src/languages.
+"""
+import numpy as np
+import pygame
+import pygame.freetype
+from src.stroke_geometry import cumulative_lengths, resample_stroke, simplify_stroke
+
+
+RASTER_SIZE = 160  # Pixels per em when rasterizing
+COVERAGE_THRESHOLD = 128  # Glyph pixels at least this opaque (0-255) are ink
+MIN_STROKE_FRACTION = 0.06  # Strokes shorter than this fraction of the glyph size are dropped
+JUNCTION_MERGE_FRACTION = 0.1  # Junctions linked by a piece shorter than this (of the glyph size) are merged
+JOIN_ANGLE = 40  # Degrees a stroke may bend at a junction and still be joined into one
+GLYPH_BOX = 70  # Size of the glyph's longer side in the 0-100 box
+POINT_SPACING = 5  # Distance between output points in the 0-100 box
+
+# Ring of 8-neighbour offsets (dy, dx), clockwise from north
+RING = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+def rasterize_glyph(font, char, size=RASTER_SIZE):
+    """
+    Render one character as a boolean ink mask
+    font: pygame.freetype.Font
+    Returns: (H, W) bool array indexed [y, x], or None if the font has no glyph for it
+    """
+    if font.get_metrics(char, size=size)[0] is None:
+        return None
+    buffer, (width, height) = font.render_raw(char, size=size)
+    if width == 0 or height == 0:
+        return None
+    coverage = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width)
+    return coverage >= COVERAGE_THRESHOLD
+
+
+def _neighbours(image):
+    """The 8 neighbours of every pixel of a zero-padded image, in RING order"""
+    height, width = image.shape
+    return [image[1 + dy:height - 1 + dy, 1 + dx:width - 1 + dx] for dy, dx in RING]
+
+
+def thin(mask):
+    """
+    Thin a binary image to a one-pixel-wide skeleton (Zhang-Suen)
+    Each sub-iteration removes all deletable border pixels at once with array operations.
+    Returns: bool array of the same shape
+    """
+    image = np.pad(mask.astype(np.uint8), 1)
+    center = image[1:-1, 1:-1]
+    while True:
+        changed = False
+        for step in (0, 1):
+            p = _neighbours(image)  # p[0] north, p[2] east, p[4] south, p[6] west
+            count = sum(p)
+            transitions = sum((p[i] == 0) & (p[(i + 1) % 8] == 1) for i in range(8))
+            if step == 0:
+                side = (p[0] * p[2] * p[4] == 0) & (p[2] * p[4] * p[6] == 0)
+            else:
+                side = (p[0] * p[2] * p[6] == 0) & (p[0] * p[4] * p[6] == 0)
+            delete = (center == 1) & (count >= 2) & (count <= 6) & (transitions == 1) & side
+            if delete.any():
+                center[delete] = 0
+                changed = True
+        if not changed:
+            break
+    _remove_corners(image)
+    return image[1:-1, 1:-1].astype(bool)
+
+
+def _ring_components(present):
+    """Number of 8-connected groups among a pixel's neighbours (list of 8 bools in RING order)"""
+    cells = [RING[i] for i in range(8) if present[i]]
+    seen = set()
+    groups = 0
+    for cell in cells:
+        if cell in seen:
+            continue
+        groups += 1
+        pending = [cell]
+        seen.add(cell)
+        while pending:
+            y, x = pending.pop()
+            for other in cells:
+                if other not in seen and abs(other[0] - y) <= 1 and abs(other[1] - x) <= 1:
+                    seen.add(other)
+                    pending.append(other)
+    return groups
+
+
+def _remove_corners(image):
+    """
+    Delete staircase corner pixels Zhang-Suen leaves behind, so every
+    skeleton pixel on a line has exactly two neighbours
+    image: zero-padded uint8 array, modified in place
+    """
+    p = _neighbours(image)
+    center = image[1:-1, 1:-1]
+    corner = (p[0] & p[2]) | (p[2] & p[4]) | (p[4] & p[6]) | (p[6] & p[0])
+    for y, x in zip(*np.nonzero((center == 1) & (corner == 1))):
+        y += 1
+        x += 1
+        present = [image[y + dy, x + dx] == 1 for dy, dx in RING]
+        # Keep end points and pixels whose removal would split the skeleton
+        if sum(present) >= 2 and _ring_components(present) == 1:
+            image[y, x] = 0
+
+
+def trace_skeleton(skeleton):
+    """
+    Split a skeleton into polylines that run between end and junction pixels
+    Closed loops without any such pixel become one closed polyline.
+    Returns: list of (polyline as list of (x, y), start node, end node); nodes
+    are junction ids, or None at a free end
+    """
+    pixels = set(zip(*np.nonzero(skeleton)))
+    
+    def neighbours(pixel):
+        y, x = pixel
+        return [(y + dy, x + dx) for dy, dx in RING if (y + dy, x + dx) in pixels]
+    
+    degree = {pixel: len(neighbours(pixel)) for pixel in pixels}
+    junctions = {pixel for pixel, d in degree.items() if d > 2}
+    
+    # Adjacent junction pixels form one junction
+    node_of = {}
+    node = 0
+    for pixel in sorted(junctions):
+        if pixel in node_of:
+            continue
+        node += 1
+        pending = [pixel]
+        node_of[pixel] = node
+        while pending:
+            for other in neighbours(pending.pop()):
+                if other in junctions and other not in node_of:
+                    node_of[other] = node
+                    pending.append(other)
+    
+    visited = set()  # Pixel pairs already walked, in both directions
+    paths = []
+    starts = [pixel for pixel in pixels if degree[pixel] != 2]
+    for start in sorted(starts):
+        for step in neighbours(start):
+            if (start, step) in visited or step in node_of and node_of.get(start) == node_of[step]:
+                continue
+            path = [start]
+            previous, current = start, step
+            while True:
+                visited.add((previous, current))
+                visited.add((current, previous))
+                path.append(current)
+                if degree[current] != 2:
+                    break
+                following = [n for n in neighbours(current) if n != previous]
+                previous, current = current, following[0]
+                if (previous, current) in visited:
+                    break
+            paths.append(([(x, y) for y, x in path], node_of.get(start), node_of.get(path[-1])))
+    
+    # Loops made only of two-neighbour pixels (e.g. the letter O)
+    remaining = {pixel for pixel in pixels if degree[pixel] == 2 and
+                 not any((pixel, n) in visited for n in neighbours(pixel))}
+    while remaining:
+        start = min(remaining)
+        path = [start]
+        previous, current = start, neighbours(start)[0]
+        while current != start and current in remaining:
+            path.append(current)
+            following = [n for n in neighbours(current) if n != previous]
+            previous, current = current, following[0]
+        path.append(start)
+        remaining.difference_update(path)
+        paths.append(([(x, y) for y, x in path], None, None))
+    return paths
+
+
+def _direction(points, from_end, reach):
+    """Unit vector pointing out of a polyline at one end, over up to `reach` pixels of it"""
+    points = np.asarray(points[::-1] if from_end else points, dtype=float)
+    distances = cumulative_lengths(points)
+    along = min(reach, distances[-1])
+    reference = np.array([np.interp(along, distances, points[:, 0]),
+                          np.interp(along, distances, points[:, 1])])
+    vector = points[0] - reference
+    length = np.hypot(*vector)
+    return vector / length if length else vector
+
+
+def join_strokes(paths, min_length, merge_length):
+    """
+    Drop short pieces and join pieces that continue straight through a junction
+    paths: output of trace_skeleton
+    min_length: pieces with a free end shorter than this (pixels) are dropped
+    merge_length: junctions linked by a piece shorter than this are merged into one
+    Returns: list of polylines
+    """
+    # A crossing often thins to two junctions linked by a short piece; merge them
+    merged = {}
+    
+    def root(node):
+        while node in merged:
+            node = merged[node]
+        return node
+    
+    kept = []
+    for points, start, end in paths:
+        length = cumulative_lengths(points)[-1]
+        if start is not None and end is not None and length < merge_length:
+            if root(start) != root(end):
+                merged[root(start)] = root(end)
+        elif length >= min_length:
+            kept.append((points, start, end))
+    paths = [(points, None if start is None else root(start), None if end is None else root(end))
+             for points, start, end in kept]
+    limit = np.cos(np.radians(180 - JOIN_ANGLE))
+    while True:
+        # Best pair of piece ends meeting at the same junction, pointing in opposite directions
+        best = None
+        for i, (points_a, start_a, end_a) in enumerate(paths):
+            for j in range(i + 1, len(paths)):
+                points_b, start_b, end_b = paths[j]
+                for a_end, node_a in ((False, start_a), (True, end_a)):
+                    for b_end, node_b in ((False, start_b), (True, end_b)):
+                        if node_a is None or node_a != node_b:
+                            continue
+                        alignment = float(np.dot(_direction(points_a, a_end, merge_length),
+                                                   _direction(points_b, b_end, merge_length)))
+                        if alignment <= limit and (best is None or alignment < best[0]):
+                            best = (alignment, i, j, a_end, b_end)
+        if best is None:
+            return [path[0] for path in paths]
+        _, i, j, a_end, b_end = best
+        points_a, start_a, end_a = paths[i]
+        points_b, start_b, end_b = paths[j]
+        # Orient a to end at the junction and b to start there
+        if not a_end:
+            points_a, start_a, end_a = points_a[::-1], end_a, start_a
+        if b_end:
+            points_b, start_b, end_b = points_b[::-1], end_b, start_b
+        joined = (points_a + points_b[1:], start_a, end_b)
+        paths = [path for k, path in enumerate(paths) if k not in (i, j)] + [joined]
+
+
+def order_strokes(strokes):
+    """
+    Direct each stroke and sort them roughly in writing order
+    Mostly vertical strokes run downwards, others left to right; strokes
+    are ordered by where they start, top to bottom then left to right.
+    Returns: list of polylines
+    """
+    directed = []
+    for stroke in strokes:
+        (x1, y1), (x2, y2) = stroke[0], stroke[-1]
+        if abs(y2 - y1) > abs(x2 - x1) * 0.5:
+            forward = y1 <= y2
+        else:
+            forward = x1 <= x2
+        directed.append(stroke if forward else stroke[::-1])
+    band = max((max(p[1] for p in s) for s in directed), default=0) / 10 or 1
+    return sorted(directed, key=lambda s: (round(min(p[1] for p in s) / band), s[0][0]))
+
+
+def normalize_strokes(strokes):
+    """
+    Scale strokes so the glyph's longer side is GLYPH_BOX units, centered in the 0-100 box
+    Returns: list of polylines as [x, y] lists rounded to 0.1
+    """
+    points = np.concatenate([np.asarray(stroke, dtype=float) for stroke in strokes])
+    low = points.min(axis=0)
+    extent = points.max(axis=0) - low
+    scale = GLYPH_BOX / max(extent.max(), 1)
+    offset = 50 - extent * scale / 2
+    normalized = []
+    for stroke in strokes:
+        scaled = (np.asarray(stroke, dtype=float) - low) * scale + offset
+        resampled = resample_stroke(scaled.tolist(), POINT_SPACING)
+        normalized.append([[round(x, 1), round(y, 1)] for x, y in resampled])
+    return normalized
+
+
+def glyph_strokes(font, char, size=RASTER_SIZE):
+    """
+    Extract the strokes of one character from a font
+    Returns: list of polylines in the 0-100 box, or None if the font has no glyph for it
+    """
+    mask = rasterize_glyph(font, char, size)
+    if mask is None or not mask.any():
+        return None
+    paths = trace_skeleton(thin(mask))
+    # Staircase pixels become straight runs before joining and ordering
+    paths = [(simplify_stroke(points, 1.0), start, end) for points, start, end in paths]
+    glyph_size = max(mask.shape)
+    strokes = join_strokes(paths, MIN_STROKE_FRACTION * glyph_size, JUNCTION_MERGE_FRACTION * glyph_size)
+    if not strokes:
+        return None
+    return normalize_strokes(order_strokes(strokes))
+
+
+def open_font(path):
+    """Load a font file for glyph_strokes (None uses pygame's default font)"""
+    if not pygame.freetype.get_init():
+        pygame.freetype.init()
+    font = pygame.freetype.Font(path)
+    font.antialiased = True
+    return font
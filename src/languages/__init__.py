@@ -1,3 +1,39 @@
 """
 Language character data modules
 """
+import importlib
+import json
+import os
+import config
+
+
+# Language ids in menu order; each has a module of the same name
+LANGUAGE_IDS = ['english', 'numbers', 'korean', 'chinese']
+
+
+def get_language_module(language_id):
+    """Import the character data module for a language id (None if unknown)"""
+    if language_id not in LANGUAGE_IDS:
+        return None
+    return importlib.import_module(f'src.languages.{language_id}')
+
+
+def load_generated_strokes(language_id, characters):
+    """
+    Merge strokes made by generate-strokes.py into a language's CHARACTERS
+    Generated strokes replace hand-written ones; names and pronunciations are kept.
+    """
+    path = os.path.join(config.STROKES_DIR, f'{language_id}.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            generated = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        print(f"Could not load generated strokes: {e}")
+        return
+    
+    for char, entry in generated.items():
+        merged = dict(characters.get(char, {'name': char}))
+        merged['strokes'] = [[tuple(point) for point in stroke] for stroke in entry['strokes']]
+        characters[char] = merged
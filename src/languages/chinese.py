@@ -3,6 +3,7 @@ Chinese Character Data
 Basic Chinese characters for learning
 """
 import math
+from src.languages import load_generated_strokes
 
 
 def create_line_points(x1, y1, x2, y2, num_points=10):
@@ -212,6 +213,7 @@ CHARACTERS = {
         'pronunciation': 'hǎo (good)'
     },
 }
+load_generated_strokes('chinese', CHARACTERS)
 
 
 def get_character(char):
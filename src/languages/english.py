@@ -3,6 +3,7 @@ English Alphabet Character Data
 Each character has stroke paths defined as coordinate lists
 """
 import math
+from src.languages import load_generated_strokes
 
 
 def create_circle_points(center_x, center_y, radius, num_points=20):
@@ -259,6 +260,7 @@ CHARACTERS = {
         'pronunciation': 'zed'
     },
 }
+load_generated_strokes('english', CHARACTERS)
 
 
 def get_character(char):
@@ -3,6 +3,7 @@ Korean (Hangul) Character Data
 Basic Hangul characters for learning
 """
 import math
+from src.languages import load_generated_strokes
 
 
 def create_line_points(x1, y1, x2, y2, num_points=10):
@@ -223,6 +224,7 @@ CHARACTERS = {
         'pronunciation': 'da'
     },
 }
+load_generated_strokes('korean', CHARACTERS)
 
 
 def get_character(char):
@@ -2,6 +2,7 @@
 Numbers Character Data (0-9)
 """
 import math
+from src.languages import load_generated_strokes
 
 
 def create_circle_points(center_x, center_y, radius, num_points=20):
@@ -109,6 +110,7 @@ CHARACTERS = {
         'pronunciation': 'nine'
     },
 }
+load_generated_strokes('numbers', CHARACTERS)
 
 
 def get_character(char):
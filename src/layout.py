@@ -0,0 +1,97 @@
+"""
+Layout - Screen rects for every screen, computed once per screen size
+"""
+import pygame
+import config
+
+
+# Size the hand-tuned positions below were designed for (3.5" screen)
+BASE_WIDTH = 480
+BASE_HEIGHT = 320
+
+# Layouts already computed, keyed by (width, height)
+_layouts = {}
+
+
+class Layout:
+    """
+    Positions and sizes for the menu and tracing screens
+    Everything is scaled from the 480x320 design by the smaller of the two
+    axis ratios, so content keeps its proportions on 800x480 and 1024x600
+    panels. Rects are shared between callers and must not be modified.
+    """
+    
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.scale = min(width / BASE_WIDTH, height / BASE_HEIGHT)
+        center_x = width // 2
+        
+        # Fonts
+        self.font_large = self.px(config.FONT_SIZE_LARGE)
+        self.font_medium = self.px(config.FONT_SIZE_MEDIUM)
+        self.font_small = self.px(config.FONT_SIZE_SMALL)
+        self.font_caption = self.px(config.FONT_SIZE_SMALL - 4)
+        self.font_celebration = self.px(96)
+        
+        # Menu screen
+        self.menu_title_center = (center_x, self.px(20))
+        self.menu_prompt_center = (center_x, self.px(35))
+        self.language_buttons = self._centered_row(4, self.px(100), self.px(config.BUTTON_HEIGHT),
+                                                   self.px(8), self.px(50))
+        self.language_label_center = (center_x, self.px(115))
+        grid_top = self.px(130)
+        self.character_grid = pygame.Rect(0, grid_top, width, height - grid_top - self.px(10))
+        self.character_button_size = self.px(config.CHARACTER_BUTTON_SIZE)
+        self.character_grid_spacing = self.px(10)
+        
+        # Tracing screen
+        self.character_name_center = (center_x, self.px(15))
+        self.pronunciation_center = (center_x, self.px(30))
+        display_size = self.px(config.CHARACTER_DISPLAY_SIZE)
+        self.character_area = pygame.Rect((width - display_size) // 2, self.px(50),
+                                          display_size, display_size)
+        self.stroke_hint_center = (center_x, height - self.px(62))
+        bar_width = self.px(150)
+        self.progress_bar = pygame.Rect((width - bar_width) // 2, height - self.px(50),
+                                        bar_width, self.px(12))
+        self.control_buttons = self._centered_row(4, self.px(80), self.px(30),
+                                                  self.px(5), height - self.px(35))
+        self.screen_center = (center_x, height // 2)
+        
+        # Tracing distances and line widths, so scoring and ink keep their
+        # proportions to the character
+        self.tracing_tolerance = self.px(config.TRACING_TOLERANCE)
+        self.guide_sample_spacing = self.px(config.GUIDE_SAMPLE_SPACING)
+        self.guide_line_width = self.px(config.GUIDE_LINE_WIDTH)
+        self.user_line_width = self.px(config.USER_LINE_WIDTH)
+        self.dash_length = self.px(config.DASH_LENGTH)
+        self.dash_gap = self.px(config.DASH_GAP)
+    
+    def px(self, value):
+        """Scale a length from the 480x320 design to this screen"""
+        return max(1, int(round(value * self.scale)))
+    
+    def _centered_row(self, count, item_width, item_height, spacing, y):
+        """Rects for `count` equal items in a horizontally centered row"""
+        total_width = count * item_width + (count - 1) * spacing
+        start_x = (self.width - total_width) // 2
+        return [
+            pygame.Rect(start_x + i * (item_width + spacing), y, item_width, item_height)
+            for i in range(count)
+        ]
+
+
+def get_layout(size=None):
+    """Get the layout for a screen size, computing it on first use"""
+    size = tuple(size) if size else (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+    layout = _layouts.get(size)
+    if layout is None:
+        layout = Layout(*size)
+        _layouts[size] = layout
+    return layout
+
+
+def invalidate_layouts():
+    """Forget computed layouts (call when the display is resized)"""
+    _layouts.clear()
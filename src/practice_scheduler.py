@@ -0,0 +1,219 @@
+"""
+Practice Scheduler - Picks the next character to trace with SM-2 spaced repetition
+
+Each attempt is graded 0-5 from its completion, shape score and time taken.
+Characters traced well come back after longer and longer intervals, failed
+ones come back after a short delay. Characters that are due come first, then
+characters never traced (in pack order), then whichever is due soonest.
+Both queues are heaps updated per attempt, so choosing the next character
+takes O(log n) however many characters the pack has.
+
+Reading a language's history means waiting for the progress store's writer
+and scanning every past attempt, so schedulers are built on a background
+thread when a language is opened (load_scheduler) and the Next button only
+uses one that is ready.
+"""
+import heapq
+import threading
+import time
+from collections import namedtuple
+import config
+from src.languages import get_language_module
+from src.progress_store import get_progress_store
+
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_QUALITY = 3  # Grades below this reset the repetition count
+
+# SM-2 state of a character that has been traced at least once
+ReviewState = namedtuple('ReviewState', [
+    'ease',  # Interval growth factor, at least MIN_EASE
+    'repetitions',  # Passing attempts in a row
+    'interval',  # Seconds between the last attempt and the next review
+    'due',  # Seconds since the epoch when the character should be practised again
+])
+
+_schedulers = {}  # Language -> PracticeScheduler, once built
+_loading = {}  # Language -> attempts recorded while its scheduler is being built
+_lock = threading.Lock()
+
+
+def attempt_quality(score, shape_score, completed, duration):
+    """
+    Grade an attempt on the SM-2 scale
+    score: completion (0-1); shape_score: stroke shape match (0-1)
+    completed: completion threshold reached; duration: seconds taken
+    Returns: 0-2 for unfinished attempts, 3-5 for finished ones
+    """
+    if not completed:
+        return min(PASSING_QUALITY - 1, int(score * PASSING_QUALITY))
+    quality = PASSING_QUALITY + round(2 * shape_score)
+    if duration > config.PRACTICE_SLOW_SECONDS:
+        quality -= 1
+    return max(quality, PASSING_QUALITY)
+
+
+def review(state, quality, timestamp):
+    """
+    Apply one graded attempt to a character's SM-2 state
+    state: ReviewState, or None for a character not traced before
+    Returns: new ReviewState
+    """
+    ease, repetitions, interval = (state.ease, state.repetitions, state.interval) if state else (INITIAL_EASE, 0, 0)
+    miss = 5 - quality
+    ease = max(MIN_EASE, ease + 0.1 - miss * (0.08 + miss * 0.02))
+    if quality < PASSING_QUALITY:
+        repetitions = 0
+        interval = config.PRACTICE_RETRY_DELAY
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = config.PRACTICE_FIRST_INTERVAL
+        elif repetitions == 2:
+            interval = config.PRACTICE_SECOND_INTERVAL
+        else:
+            interval = interval * ease
+    return ReviewState(ease, repetitions, interval, timestamp + interval)
+
+
+class PracticeScheduler:
+    """Spaced-repetition queue over the characters of one language"""
+    
+    def __init__(self, characters, attempts=()):
+        """
+        characters: every character in the pack, in the order new ones are introduced
+        attempts: past Attempt records (oldest first), e.g. from ProgressStore.get_attempts
+        """
+        self.order = {character: i for i, character in enumerate(characters)}
+        self.states = {}  # Character -> ReviewState
+        for attempt in attempts:
+            if attempt.character in self.order:
+                quality = attempt_quality(attempt.score, attempt.shape_score,
+                                          attempt.completed, attempt.duration)
+                self.states[attempt.character] = review(self.states.get(attempt.character),
+                                                        quality, attempt.timestamp)
+        
+        # Entries go stale when a character is reviewed again; they are
+        # skipped when they reach the top instead of being searched for
+        self.reviews = [(state.due, self.order[character], character)
+                        for character, state in self.states.items()]
+        self.new = [(i, character) for character, i in self.order.items() if character not in self.states]
+        heapq.heapify(self.reviews)
+        heapq.heapify(self.new)
+    
+    def record(self, character, score, shape_score, completed, duration, timestamp=None):
+        """Update the schedule after an attempt"""
+        if character not in self.order:
+            return
+        quality = attempt_quality(score, shape_score, completed, duration)
+        state = review(self.states.get(character), quality, time.time() if timestamp is None else timestamp)
+        self.states[character] = state
+        heapq.heappush(self.reviews, (state.due, self.order[character], character))
+        # Rebuild once stale entries outnumber live ones, to bound memory
+        if len(self.reviews) > 2 * len(self.states) + 16:
+            self.reviews = [(s.due, self.order[c], c) for c, s in self.states.items()]
+            heapq.heapify(self.reviews)
+    
+    def _top_review(self, exclude):
+        """First live entry of the review queue that is not `exclude` (or None)"""
+        held = []
+        top = None
+        while self.reviews:
+            due, order, character = self.reviews[0]
+            if self.states[character].due != due:
+                heapq.heappop(self.reviews)
+            elif character == exclude:
+                held.append(heapq.heappop(self.reviews))
+            else:
+                top = self.reviews[0]
+                break
+        for entry in held:
+            heapq.heappush(self.reviews, entry)
+        return top
+    
+    def _top_new(self, exclude):
+        """First never-traced character that is not `exclude` (or None)"""
+        while self.new and self.new[0][1] in self.states:
+            heapq.heappop(self.new)
+        if not self.new:
+            return None
+        if self.new[0][1] != exclude:
+            return self.new[0][1]
+        # The excluded character is at the top; look just below it
+        held = heapq.heappop(self.new)
+        character = self._top_new(exclude)
+        heapq.heappush(self.new, held)
+        return character
+    
+    def next_character(self, exclude=None, now=None):
+        """
+        Choose the character to practise next
+        exclude: character to skip (the one just traced), unless it is the only one
+        now: current time in seconds since the epoch (default: time.time())
+        Returns: character, or None if the pack is empty
+        """
+        now = time.time() if now is None else now
+        review_entry = self._top_review(exclude)
+        if review_entry and review_entry[0] <= now:
+            return review_entry[2]
+        character = self._top_new(exclude)
+        if character is not None:
+            return character
+        if review_entry:
+            return review_entry[2]
+        return exclude if exclude in self.order else None
+
+
+def load_scheduler(language):
+    """Start building the shared scheduler for a language in the background, unless already done"""
+    with _lock:
+        if language in _schedulers or language in _loading:
+            return
+        _loading[language] = []
+    threading.Thread(target=_build_scheduler, args=(language,), name='scheduler-loader', daemon=True).start()
+
+
+def _build_scheduler(language):
+    """Read a language's past attempts and publish its scheduler (runs on the loader thread)"""
+    scheduler = None
+    try:
+        lang_module = get_language_module(language)
+        if lang_module is not None:
+            attempts = get_progress_store().get_attempts(language)
+            scheduler = PracticeScheduler(lang_module.get_all_characters(), attempts)
+    finally:
+        with _lock:
+            recorded = _loading.pop(language)
+            if scheduler is not None:
+                # Attempts made during the read; the ones already written are in `attempts`
+                read = set(attempts)
+                for attempt in recorded:
+                    if attempt not in read:
+                        scheduler.record(attempt.character, attempt.score, attempt.shape_score,
+                                         attempt.completed, attempt.duration, attempt.timestamp)
+                _schedulers[language] = scheduler
+
+
+def get_scheduler(language):
+    """
+    Shared scheduler for a language, if it has been built
+    Never waits: call load_scheduler first, ideally as soon as the language is chosen.
+    Returns: PracticeScheduler, or None if it is still loading or the language is unknown
+    """
+    with _lock:
+        return _schedulers.get(language)
+
+
+def record_practice(attempt):
+    """
+    Update the shared scheduler for the attempt's language
+    attempt: Attempt just queued with ProgressStore.record_attempt
+    """
+    with _lock:
+        scheduler = _schedulers.get(attempt.language)
+        if scheduler is not None:
+            scheduler.record(attempt.character, attempt.score, attempt.shape_score,
+                             attempt.completed, attempt.duration, attempt.timestamp)
+        elif attempt.language in _loading:
+            _loading[attempt.language].append(attempt)
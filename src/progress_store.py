@@ -0,0 +1,193 @@
+"""
+Progress Store - Every tracing attempt, kept in a local SQLite database
+
+The database runs in WAL mode, so a power cut can lose the last few
+attempts but never leaves a half-written file. Attempts are queued by the
+frame loop and written in batches by a background thread, so SD card
+latency never stalls a frame.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+import config
+
+
+SCHEMA_VERSION = 1
+
+# One finished attempt at tracing a character
+Attempt = namedtuple('Attempt', [
+    'timestamp',  # Seconds since the epoch when the attempt ended
+    'language',
+    'character',
+    'score',  # Completion (0-1) from TracingEngine.get_completion
+    'shape_score',  # Stroke shape match (0-1) from TracingEngine.get_shape_score
+    'completed',  # True if the completion threshold was reached
+    'duration',  # Seconds from the first point to the end of the attempt
+    'points',  # Number of points drawn
+])
+
+_STOP = object()  # Queue marker that ends the writer thread
+
+_progress_store = None
+
+
+class ProgressStore:
+    """Records attempts in SQLite from a background writer thread"""
+    
+    def __init__(self, path=None, flush_interval=None, batch_size=None):
+        """
+        path: database file (created if missing)
+        flush_interval: seconds an attempt may wait in the queue before being written
+        batch_size: attempts written in one transaction when they arrive quickly
+        """
+        self.path = path or config.PROGRESS_DB
+        self.flush_interval = flush_interval if flush_interval is not None else config.PROGRESS_FLUSH_INTERVAL
+        self.batch_size = batch_size or config.PROGRESS_BATCH_SIZE
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='progress-writer', daemon=True)
+        self._thread.start()
+    
+    def _connect(self):
+        """Open the database and create the schema if needed"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        # With WAL, NORMAL only risks the latest commits on power loss, never corruption
+        connection.execute('PRAGMA synchronous=NORMAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS attempts ('
+                'id INTEGER PRIMARY KEY, timestamp REAL NOT NULL, '
+                'language TEXT NOT NULL, character TEXT NOT NULL, '
+                'score REAL NOT NULL, shape_score REAL NOT NULL, completed INTEGER NOT NULL, '
+                'duration REAL NOT NULL, points INTEGER NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS attempts_by_character '
+                'ON attempts (language, character, timestamp)'
+            )
+            connection.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        return connection
+    
+    def _run(self):
+        """Writer thread: collect queued attempts and write them in batches"""
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not open progress store: {e}")
+            connection = None
+        
+        pending = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval if pending else None)
+            except queue.Empty:
+                item = None  # Waited long enough; write what has been collected
+            
+            if isinstance(item, Attempt):
+                pending.append(item)
+                if len(pending) < self.batch_size:
+                    continue
+            
+            if pending and connection is not None:
+                self._write(connection, pending)
+            pending = []
+            
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                break
+        
+        if connection is not None:
+            connection.close()
+    
+    def _write(self, connection, attempts):
+        """Insert a batch of attempts in one transaction"""
+        try:
+            with connection:
+                connection.executemany(
+                    'INSERT INTO attempts (timestamp, language, character, score, shape_score, '
+                    'completed, duration, points) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [tuple(attempt) for attempt in attempts]
+                )
+        except sqlite3.Error as e:
+            print(f"Could not save progress: {e}")
+    
+    def record_attempt(self, language, character, score, shape_score, completed, duration, points):
+        """
+        Queue an attempt for writing; returns immediately
+        Returns: the Attempt queued
+        """
+        attempt = Attempt(time.time(), language, character, float(score), float(shape_score),
+                          bool(completed), float(duration), int(points))
+        self._queue.put(attempt)
+        return attempt
+    
+    def flush(self, timeout=None):
+        """
+        Wait until every queued attempt has been written
+        Returns: True if the writer caught up within the timeout
+        """
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self, timeout=5.0):
+        """Write queued attempts and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+    
+    def get_attempts(self, language=None, character=None):
+        """
+        Read recorded attempts, oldest first (queued attempts are written first)
+        Returns: list of Attempt
+        """
+        self.flush()
+        query = ('SELECT timestamp, language, character, score, shape_score, completed, '
+                 'duration, points FROM attempts')
+        conditions = []
+        params = []
+        if language is not None:
+            conditions.append('language = ?')
+            params.append(language)
+        if character is not None:
+            conditions.append('character = ?')
+            params.append(character)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY timestamp, id'
+        
+        try:
+            connection = sqlite3.connect(self.path)
+            try:
+                rows = connection.execute(query, params).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"Could not read progress: {e}")
+            return []
+        return [Attempt(*row[:5], bool(row[5]), *row[6:]) for row in rows]
+
+
+def get_progress_store():
+    """Shared progress store, opened on first use"""
+    global _progress_store
+    if _progress_store is None:
+        _progress_store = ProgressStore()
+    return _progress_store
+
+
+def close_progress_store():
+    """Write pending attempts and stop the shared store, if it was opened"""
+    global _progress_store
+    if _progress_store is not None:
+        _progress_store.close()
+        _progress_store = None
@@ -0,0 +1,181 @@
+"""
+Pronunciation Cache - Per-character voice clips, decoded on demand within a memory budget
+
+Clips live at assets/sounds/<language>/<character>.(wav|ogg), for any of the
+language modules. A decoded clip takes far more memory than the file (about
+88 KB per second at the mixer's 22.05 kHz stereo), so a large CJK pack cannot
+stay decoded at once. Clips are instead decoded by a background thread when a
+character is about to be needed: the visible menu page, or the character just
+opened. The most recently used clips are kept, up to
+config.PRONUNCIATION_CACHE_MB.
+
+The clip directories are listed by the same thread when it starts, since a
+full CJK pack holds thousands of files and the SD card is slow to list them.
+Until then every character is assumed to have a clip, and requests for
+ones that turn out not to are dropped.
+"""
+import os
+import threading
+from collections import OrderedDict
+import pygame
+import config
+
+
+CLIP_EXTENSIONS = ('.ogg', '.wav')
+
+
+class PronunciationCache:
+    """LRU cache of decoded pronunciation clips, filled by a background thread"""
+    
+    def __init__(self, sounds_dir=None, memory_limit=None):
+        """
+        sounds_dir: directory with one sub-directory of clips per language
+        memory_limit: bytes of decoded audio to keep (default: config.PRONUNCIATION_CACHE_MB)
+        """
+        self.sounds_dir = sounds_dir or config.SOUNDS_DIR
+        self.memory_limit = memory_limit if memory_limit is not None else config.PRONUNCIATION_CACHE_MB * 1024 * 1024
+        self.volume = config.SOUND_VOLUME
+        self.clips = OrderedDict()  # (language, character) -> (Sound, bytes), least recently used first
+        self.memory_used = 0
+        self._files = None  # Language -> {character: path}, None until the decoder thread lists them
+        self._urgent = []  # Keys to decode before any prefetch
+        self._prefetch = []  # Keys of the latest prefetch request, in order
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        self._stopping = False
+    
+    def start(self):
+        """Start the decoder thread (the mixer must be initialized)"""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='pronunciation-loader', daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout=1.0):
+        """Stop the decoder thread after the clip it is decoding"""
+        if self._thread is not None:
+            with self._lock:
+                self._stopping = True
+                self._wake.notify()
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _list_files(self):
+        """Map of language -> {character: clip path} for every language directory (slow on SD cards)"""
+        files = {}
+        try:
+            languages = sorted(os.listdir(self.sounds_dir))
+        except OSError:
+            languages = []
+        for language in languages:
+            directory = os.path.join(self.sounds_dir, language)
+            if not os.path.isdir(directory):
+                continue
+            clips = files[language] = {}
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError as e:
+                print(f"Could not list pronunciations in {directory}: {e}")
+                continue
+            for name in names:
+                character, extension = os.path.splitext(name)
+                if extension.lower() in CLIP_EXTENSIONS:
+                    clips.setdefault(character, os.path.join(directory, name))
+        return files
+    
+    def _may_have_clip(self, language, character):
+        """has_clip() for callers holding the lock"""
+        return self._files is None or character in self._files.get(language, ())
+    
+    def has_clip(self, language, character):
+        """Check whether a clip file exists for a character (assumed until the directories are listed)"""
+        with self._lock:
+            return self._may_have_clip(language, character)
+    
+    def get(self, language, character):
+        """
+        Decoded clip for a character, marking it recently used
+        Returns: pygame.mixer.Sound, or None if it is not decoded yet
+        """
+        key = (language, character)
+        with self._lock:
+            entry = self.clips.get(key)
+            if entry is None:
+                return None
+            self.clips.move_to_end(key)
+            return entry[0]
+    
+    def request(self, language, character):
+        """Decode a clip as soon as possible, ahead of prefetching"""
+        with self._lock:
+            if self._may_have_clip(language, character) and (language, character) not in self.clips:
+                self._urgent.append((language, character))
+                self._wake.notify()
+    
+    def prefetch(self, language, characters):
+        """
+        Decode clips that will probably be needed soon, e.g. the visible menu page
+        Replaces the previous prefetch request, so scrolling past a page cancels it.
+        """
+        with self._lock:
+            keys = [(language, character) for character in characters
+                    if self._may_have_clip(language, character)]
+            self._prefetch = [key for key in keys if key not in self.clips]
+            # Prefetching a page should not push itself out of the cache
+            budget = self.memory_limit
+            for key in keys:
+                entry = self.clips.get(key)
+                if entry is not None and entry[1] <= budget:
+                    budget -= entry[1]
+                    self.clips.move_to_end(key)
+            self._wake.notify()
+    
+    def _next_key(self):
+        """Take the next key to decode, waiting for one (None when stopping)"""
+        with self._lock:
+            while True:
+                if self._stopping:
+                    return None
+                queue = self._urgent or self._prefetch
+                if queue:
+                    key = queue.pop(0)
+                    if key not in self.clips:
+                        return key
+                    continue
+                self._wake.wait()
+    
+    def _run(self):
+        """Decoder thread: list the clip files, then decode requested clips one at a time"""
+        if self._files is None:
+            files = self._list_files()
+            with self._lock:
+                self._files = files
+        while True:
+            key = self._next_key()
+            if key is None:
+                return
+            with self._lock:
+                path = self._files.get(key[0], {}).get(key[1])
+            if path is None:
+                continue  # Requested before the listing showed there is no clip
+            try:
+                sound = pygame.mixer.Sound(path)
+            except pygame.error as e:
+                print(f"Could not load pronunciation {path}: {e}")
+                with self._lock:
+                    self._files[key[0]].pop(key[1], None)  # Do not try again
+                continue
+            sound.set_volume(self.volume)
+            self._store(key, sound)
+    
+    def _store(self, key, sound):
+        """Add a decoded clip and evict the least recently used ones over the budget"""
+        frequency, size, channels = pygame.mixer.get_init() or (config.AUDIO_FREQUENCY, -16, 2)
+        nbytes = int(sound.get_length() * frequency) * channels * abs(size) // 8
+        with self._lock:
+            self.clips[key] = (sound, nbytes)
+            self.memory_used += nbytes
+            while self.memory_used > self.memory_limit and len(self.clips) > 1:
+                _, (_, evicted) = self.clips.popitem(last=False)
+                self.memory_used -= evicted
@@ -0,0 +1,169 @@
+"""
+Sound Manager - Short audio feedback played without delaying the frame loop
+
+The mixer is opened with a small buffer so a sound starts within a few
+milliseconds of being played. The effect clips in config.SOUNDS_DIR are
+decoded into pygame.mixer.Sound objects by a background thread at startup;
+playing a clip that is not decoded yet does nothing rather than reading the
+disk. Pronunciations are too many to keep decoded and go through a
+PronunciationCache instead (see src/pronunciation_cache.py).
+
+Clips:
+    sounds/stroke_correct.(wav|ogg)    a stroke matched the guide
+    sounds/celebration.(wav|ogg)       the character was completed
+    sounds/<language>/<character>.(wav|ogg)    pronunciation of a character
+
+Each kind of sound has its own reserved channel, so a new pronunciation
+cuts off the previous one but never a celebration, and the reverse.
+"""
+import os
+import threading
+import time
+import pygame
+import config
+from src.pronunciation_cache import PronunciationCache
+
+
+SOUND_EXTENSIONS = ('.wav', '.ogg')
+SOUND_STROKE_CORRECT = 'stroke_correct'
+SOUND_CELEBRATION = 'celebration'
+
+# Reserved mixer channels, one per kind of sound
+CHANNEL_VOICE = 0
+CHANNEL_FEEDBACK = 1
+CHANNEL_CELEBRATION = 2
+RESERVED_CHANNELS = 3
+
+PRONUNCIATION_WAIT = 1.0  # Seconds a pronunciation may wait to be decoded before it is dropped
+
+_sound_manager = None
+
+
+class SoundManager:
+    """Owns the mixer and the decoded clips"""
+    
+    def __init__(self):
+        self.enabled = False
+        self.sounds = {}  # Clip name -> pygame.mixer.Sound, filled by the loader thread
+        self.channels = {}  # Channel id -> pygame.mixer.Channel
+        self.pronunciations = PronunciationCache()
+        self.pending_pronunciation = None  # ((language, character), deadline) waiting to be decoded
+        self._loader = None
+    
+    def initialize(self):
+        """
+        Open the mixer and start decoding clips in the background
+        Returns: True if audio is available
+        """
+        if not config.SOUND_ENABLED:
+            return False
+        try:
+            pygame.mixer.pre_init(config.AUDIO_FREQUENCY, -16, 2, config.AUDIO_BUFFER)
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Could not open audio: {e}")
+            return False
+        
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        self.channels = {channel: pygame.mixer.Channel(channel) for channel in range(RESERVED_CHANNELS)}
+        self.enabled = True
+        
+        self._loader = threading.Thread(target=self._load_all, name='sound-loader', daemon=True)
+        self._loader.start()
+        self.pronunciations.start()
+        return True
+    
+    def _load_all(self):
+        """Loader thread: decode the effect clips in SOUNDS_DIR"""
+        try:
+            filenames = sorted(os.listdir(config.SOUNDS_DIR))
+        except OSError:
+            return
+        for filename in filenames:
+            if not self.enabled:
+                return  # quit() was called
+            name, extension = os.path.splitext(filename)
+            if extension.lower() not in SOUND_EXTENSIONS:
+                continue
+            path = os.path.join(config.SOUNDS_DIR, filename)
+            try:
+                sound = pygame.mixer.Sound(path)
+            except pygame.error as e:
+                print(f"Could not load sound {path}: {e}")
+                continue
+            sound.set_volume(config.SOUND_VOLUME)
+            self.sounds[name] = sound
+    
+    def wait_loaded(self, timeout=None):
+        """Wait for the loader thread to finish decoding"""
+        if self._loader is not None:
+            self._loader.join(timeout)
+    
+    def play(self, name, channel=CHANNEL_FEEDBACK):
+        """
+        Start a clip on a reserved channel, replacing whatever that channel was playing
+        Returns: True if the clip was loaded and started
+        """
+        sound = self.sounds.get(name)
+        if not self.enabled or sound is None:
+            return False
+        self.channels[channel].play(sound)
+        return True
+    
+    def play_pronunciation(self, language, character):
+        """
+        Say a character, if there is a clip for it
+        A clip that is not decoded yet is requested and played by update()
+        once it is ready, unless that takes longer than PRONUNCIATION_WAIT.
+        Returns: True if the clip started at once
+        """
+        if not self.enabled:
+            return False
+        sound = self.pronunciations.get(language, character)
+        if sound is not None:
+            self.pending_pronunciation = None
+            self.channels[CHANNEL_VOICE].play(sound)
+            return True
+        if self.pronunciations.has_clip(language, character):
+            self.pronunciations.request(language, character)
+            self.pending_pronunciation = ((language, character), time.monotonic() + PRONUNCIATION_WAIT)
+        return False
+    
+    def prefetch_pronunciations(self, language, characters):
+        """Start decoding the clips of characters about to be shown (e.g. a menu page)"""
+        if self.enabled:
+            self.pronunciations.prefetch(language, characters)
+    
+    def update(self):
+        """Per-frame work: start a requested pronunciation once it has been decoded"""
+        if self.pending_pronunciation is None:
+            return
+        (language, character), deadline = self.pending_pronunciation
+        if time.monotonic() > deadline:
+            self.pending_pronunciation = None
+        elif self.pronunciations.get(language, character) is not None:
+            self.play_pronunciation(language, character)
+    
+    def play_stroke_correct(self):
+        """Short confirmation after a well-drawn stroke"""
+        return self.play(SOUND_STROKE_CORRECT, CHANNEL_FEEDBACK)
+    
+    def play_celebration(self):
+        """Fanfare for a completed character"""
+        return self.play(SOUND_CELEBRATION, CHANNEL_CELEBRATION)
+    
+    def quit(self):
+        """Stop playback and close the mixer"""
+        if self.enabled:
+            self.enabled = False
+            self.wait_loaded(1.0)  # Let the loaders finish the clip they are decoding
+            self.pronunciations.stop()
+            pygame.mixer.quit()
+
+
+def get_sound_manager():
+    """Shared sound manager (silent until initialize() succeeds)"""
+    global _sound_manager
+    if _sound_manager is None:
+        _sound_manager = SoundManager()
+    return _sound_manager
@@ -0,0 +1,101 @@
+"""
+Stroke Animation - Writes a character's guide strokes one after another, in order
+
+Every stroke's cumulative arc length is computed once, along with the time
+each stroke starts. A frame then finds the stroke being written with a
+binary search over the start times, finds the pen position with a binary
+search over that stroke's lengths, and draws only the piece written since
+the last frame onto a cached layer.
+"""
+import numpy as np
+import pygame
+from src.stroke_geometry import cumulative_lengths
+from src.stroke_renderer import draw_polyline, polyline_rect
+
+
+class StrokeAnimation:
+    """Animated demonstration of stroke order and direction"""
+    
+    def __init__(self, strokes, speed, pause, color, width):
+        """
+        strokes: polylines in screen coordinates, in writing order
+        speed: pen speed in pixels per second
+        pause: seconds between the end of one stroke and the start of the next
+        color: ink color; width: line width in pixels
+        """
+        strokes = [np.asarray(stroke, dtype=float).reshape(-1, 2) for stroke in strokes if len(stroke)]
+        self.rect = polyline_rect(np.concatenate(strokes) if strokes else [], width)
+        self.layer = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.color = color
+        self.width = width
+        self.speed = speed
+        
+        # Per stroke: points relative to the layer, arc length at each point
+        self.strokes = [stroke - self.rect.topleft for stroke in strokes]
+        self.lengths = [cumulative_lengths(stroke) for stroke in self.strokes]
+        durations = np.array([lengths[-1] / speed for lengths in self.lengths])
+        self.starts = np.concatenate(([0.0], np.cumsum(durations + pause)[:-1]))
+        self.duration = float(self.starts[-1] + durations[-1]) if strokes else 0.0
+        
+        self.time = 0.0
+        self.drawn = (0, 0.0)  # (stroke index, arc length) already on the layer
+    
+    def _position(self, time):
+        """Where the pen is at a time: (stroke index, arc length along it)"""
+        index = int(np.searchsorted(self.starts, time, side='right')) - 1
+        if index < 0:
+            return 0, 0.0
+        return index, min((time - self.starts[index]) * self.speed, self.lengths[index][-1])
+    
+    def _point_at(self, index, along):
+        """Point at an arc length along a stroke (layer coordinates)"""
+        lengths = self.lengths[index]
+        points = self.strokes[index]
+        return [float(np.interp(along, lengths, points[:, 0])), float(np.interp(along, lengths, points[:, 1]))]
+    
+    def _draw_piece(self, index, start, end):
+        """Draw a stroke from one arc length to another, including the corners in between"""
+        lengths = self.lengths[index]
+        first = int(np.searchsorted(lengths, start, side='right'))
+        last = int(np.searchsorted(lengths, end, side='left'))
+        points = [self._point_at(index, start)] + self.strokes[index][first:last].tolist()
+        points.append(self._point_at(index, end))
+        draw_polyline(self.layer, self.color, points, self.width)
+    
+    def update(self, dt):
+        """Advance the animation and draw what the pen wrote since the last update"""
+        if not self.strokes:
+            return
+        self.time += dt
+        target_index, target_along = self._position(self.time)
+        index, along = self.drawn
+        while True:
+            end = target_along if index == target_index else self.lengths[index][-1]
+            if end > along or (along == 0 and end == 0 and index < target_index):
+                self._draw_piece(index, along, end)
+            if index == target_index:
+                break
+            # Strokes finished within this frame are completed before the next starts
+            index, along = index + 1, 0.0
+        self.drawn = (index, float(end))
+    
+    def is_finished(self):
+        """Check whether every stroke has been written"""
+        return self.time >= self.duration
+    
+    def pen_position(self):
+        """Screen position of the pen while it is writing, else None"""
+        if not self.strokes or self.is_finished():
+            return None
+        index, along = self._position(self.time)
+        if along >= self.lengths[index][-1]:
+            return None  # Pausing between strokes
+        x, y = self._point_at(index, along)
+        return int(round(x + self.rect.left)), int(round(y + self.rect.top))
+    
+    def render(self, screen):
+        """Draw the strokes written so far and the pen tip"""
+        screen.blit(self.layer, self.rect)
+        pen = self.pen_position()
+        if pen:
+            pygame.draw.circle(screen, self.color, pen, self.width)
@@ -0,0 +1,373 @@
+"""
+Stroke Archive - Compact binary log of every traced attempt, for later review
+
+File layout:
+    header    b'LPSA' and a version byte
+    chunks    type byte, varint payload length, payload
+      'A'     attempt: language and character (varint length + UTF-8 each),
+              start time (varint ms since the epoch), number of strokes
+      'S'     stroke: start (varint ms after the attempt start), point count,
+              then per point zigzag-varint dx, dy and varint dt from the
+              previous point (the first point is relative to 0, 0)
+      'I'     index: attempt count, then each attempt's file offset as a
+              varint delta from the previous one
+    trailer   index chunk offset (8 bytes, little-endian) and b'LPSX'
+
+Each attempt is one 'A' chunk followed by its 'S' chunks. The index and
+trailer are written when the writer closes and replaced when it reopens
+the file to append. Each attempt reaches the operating system as soon as it
+is appended, so a killed process loses nothing; fsync() runs at most once
+per config.STROKE_ARCHIVE_SYNC_INTERVAL so SD card writes rarely hold up a
+frame. A file whose writer never closed (e.g. after a power cut) is
+still readable: the index is rebuilt by scanning the chunks, and a partly
+written last attempt is ignored.
+"""
+import os
+import struct
+import time
+from collections import namedtuple
+import config
+
+
+MAGIC = b'LPSA'
+VERSION = 1
+TRAILER_MAGIC = b'LPSX'
+HEADER_SIZE = len(MAGIC) + 1
+TRAILER = struct.Struct('<Q4s')
+
+CHUNK_ATTEMPT = b'A'
+CHUNK_STROKE = b'S'
+CHUNK_INDEX = b'I'
+
+# One attempt read back from the archive; strokes are lists of (x, y, t),
+# with t in milliseconds after start_time
+ArchivedAttempt = namedtuple('ArchivedAttempt', ['language', 'character', 'start_time', 'strokes'])
+
+_stroke_archive = None
+
+
+def encode_varint(value, out):
+    """Append an unsigned integer to a bytearray, 7 bits per byte"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    """
+    Read an unsigned varint
+    Returns: (value, position after it); raises IndexError if the data ends first
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value):
+    """Map signed to unsigned so small negative deltas stay short"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    """Inverse of _zigzag"""
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _encode_text(text, out):
+    """Append a length-prefixed UTF-8 string"""
+    encoded = text.encode('utf-8')
+    encode_varint(len(encoded), out)
+    out += encoded
+
+
+def _decode_text(data, pos):
+    """Read a length-prefixed UTF-8 string; returns (text, position after it)"""
+    length, pos = decode_varint(data, pos)
+    if pos + length > len(data):
+        raise IndexError("text runs past the end of the chunk")
+    return data[pos:pos + length].decode('utf-8'), pos + length
+
+
+def _chunk(chunk_type, payload, out):
+    """Append a chunk (type, varint length, payload)"""
+    out += chunk_type
+    encode_varint(len(payload), out)
+    out += payload
+
+
+def encode_attempt(language, character, start_time, strokes):
+    """
+    Encode one attempt as its 'A' chunk followed by one 'S' chunk per stroke
+    start_time: seconds since the epoch
+    strokes: lists of (x, y, t) points, t in milliseconds on any clock
+    Returns: bytes
+    """
+    strokes = [stroke for stroke in strokes if stroke]
+    first_time = min((int(round(stroke[0][2])) for stroke in strokes), default=0)
+    
+    header = bytearray()
+    _encode_text(language, header)
+    _encode_text(character, header)
+    encode_varint(int(round(start_time * 1000)), header)
+    encode_varint(len(strokes), header)
+    out = bytearray()
+    _chunk(CHUNK_ATTEMPT, header, out)
+    
+    for stroke in strokes:
+        payload = bytearray()
+        previous_x = previous_y = 0
+        previous_t = int(round(stroke[0][2]))
+        encode_varint(previous_t - first_time, payload)
+        encode_varint(len(stroke), payload)
+        for x, y, t in stroke:
+            x, y, t = int(round(x)), int(round(y)), int(round(t))
+            encode_varint(_zigzag(x - previous_x), payload)
+            encode_varint(_zigzag(y - previous_y), payload)
+            encode_varint(max(t - previous_t, 0), payload)
+            previous_x, previous_y, previous_t = x, y, max(t, previous_t)
+        _chunk(CHUNK_STROKE, payload, out)
+    return bytes(out)
+
+
+def _decode_stroke(payload):
+    """Decode an 'S' chunk payload into a list of (x, y, t) points"""
+    t, pos = decode_varint(payload, 0)
+    count, pos = decode_varint(payload, pos)
+    x = y = 0
+    points = []
+    for _ in range(count):
+        dx, pos = decode_varint(payload, pos)
+        dy, pos = decode_varint(payload, pos)
+        dt, pos = decode_varint(payload, pos)
+        x += _unzigzag(dx)
+        y += _unzigzag(dy)
+        t += dt
+        points.append((x, y, t))
+    return points
+
+
+def _read_chunk(f):
+    """
+    Read the chunk at the current file position
+    Returns: (type, payload), or None at the end of the file or a cut-off chunk
+    """
+    chunk_type = f.read(1)
+    if not chunk_type:
+        return None
+    length = 0
+    shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        length |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            break
+        shift += 7
+    payload = f.read(length)
+    if len(payload) < length:
+        return None
+    return chunk_type, payload
+
+
+def _read_attempt_header(payload):
+    """Decode an 'A' chunk payload into (language, character, start_time, stroke count)"""
+    language, pos = _decode_text(payload, 0)
+    character, pos = _decode_text(payload, pos)
+    start_ms, pos = decode_varint(payload, pos)
+    stroke_count, pos = decode_varint(payload, pos)
+    return language, character, start_ms / 1000, stroke_count
+
+
+def _load_index(f):
+    """
+    Find every attempt in an open archive
+    Returns: (attempt offsets, offset where the next attempt should be written)
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    
+    # A cleanly closed file ends with a trailer pointing at its index
+    if size >= HEADER_SIZE + TRAILER.size:
+        f.seek(size - TRAILER.size)
+        index_offset, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic == TRAILER_MAGIC and HEADER_SIZE <= index_offset < size:
+            f.seek(index_offset)
+            chunk = _read_chunk(f)
+            if chunk and chunk[0] == CHUNK_INDEX:
+                try:
+                    count, pos = decode_varint(chunk[1], 0)
+                    offsets = []
+                    offset = 0
+                    for _ in range(count):
+                        delta, pos = decode_varint(chunk[1], pos)
+                        offset += delta
+                        offsets.append(offset)
+                    return offsets, index_offset
+                except IndexError:
+                    pass
+    
+    # Otherwise scan, keeping only attempts whose strokes were all written
+    offsets = []
+    f.seek(HEADER_SIZE)
+    end = HEADER_SIZE
+    while True:
+        offset = f.tell()
+        chunk = _read_chunk(f)
+        if chunk is None or chunk[0] != CHUNK_ATTEMPT:
+            break
+        try:
+            stroke_count = _read_attempt_header(chunk[1])[3]
+        except (IndexError, UnicodeDecodeError):
+            break
+        strokes = [_read_chunk(f) for _ in range(stroke_count)]
+        if any(stroke is None or stroke[0] != CHUNK_STROKE for stroke in strokes):
+            break
+        offsets.append(offset)
+        end = f.tell()
+    return offsets, end
+
+
+class StrokeArchiveWriter:
+    """Appends attempts to an archive file"""
+    
+    def __init__(self, path):
+        """
+        path: archive file; created if missing, otherwise appended to
+        Raises OSError if it cannot be opened, ValueError if it is not an archive
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, 'r+b')
+            if self.file.read(HEADER_SIZE) != MAGIC + bytes([VERSION]):
+                self.file.close()
+                raise ValueError(f"Not a stroke archive: {path}")
+            self.offsets, end = _load_index(self.file)
+            # Appending replaces the old index (and any partly written attempt)
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.file = open(path, 'w+b')
+            self.file.write(MAGIC + bytes([VERSION]))
+            self.offsets = []
+        self.last_sync = time.monotonic()
+    
+    def append(self, language, character, strokes, start_time=None):
+        """
+        Add an attempt
+        strokes: lists of (x, y, t) points, t in milliseconds on any clock
+        start_time: seconds since the epoch (default: now)
+        Returns: index of the attempt in the archive
+        """
+        data = encode_attempt(language, character,
+                              time.time() if start_time is None else start_time, strokes)
+        self.offsets.append(self.file.tell())
+        self.file.write(data)
+        self.flush(sync=time.monotonic() - self.last_sync >= config.STROKE_ARCHIVE_SYNC_INTERVAL)
+        return len(self.offsets) - 1
+    
+    def flush(self, sync=False):
+        """Hand buffered attempts to the operating system, and to the disk if sync is set"""
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+            self.last_sync = time.monotonic()
+    
+    def close(self):
+        """Write the index and trailer and close the file"""
+        if self.file.closed:
+            return
+        payload = bytearray()
+        encode_varint(len(self.offsets), payload)
+        previous = 0
+        for offset in self.offsets:
+            encode_varint(offset - previous, payload)
+            previous = offset
+        index_offset = self.file.tell()
+        out = bytearray()
+        _chunk(CHUNK_INDEX, payload, out)
+        out += TRAILER.pack(index_offset, TRAILER_MAGIC)
+        self.file.write(out)
+        self.flush(sync=True)
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StrokeArchiveReader:
+    """Reads attempts one at a time, by number or in order"""
+    
+    def __init__(self, path):
+        """Raises OSError if the file cannot be opened, ValueError if it is not an archive"""
+        self.file = open(path, 'rb')
+        if self.file.read(HEADER_SIZE) != MAGIC + bytes([VERSION]):
+            self.file.close()
+            raise ValueError(f"Not a stroke archive: {path}")
+        self.offsets = _load_index(self.file)[0]
+    
+    def __len__(self):
+        return len(self.offsets)
+    
+    def read(self, index):
+        """Read one attempt by its number; returns ArchivedAttempt"""
+        self.file.seek(self.offsets[index])
+        _, payload = _read_chunk(self.file)
+        language, character, start_time, stroke_count = _read_attempt_header(payload)
+        strokes = [_decode_stroke(_read_chunk(self.file)[1]) for _ in range(stroke_count)]
+        return ArchivedAttempt(language, character, start_time, strokes)
+    
+    def __iter__(self):
+        """Stream every attempt in order without loading the whole file"""
+        for index in range(len(self.offsets)):
+            yield self.read(index)
+    
+    def close(self):
+        """Close the file"""
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_stroke_archive():
+    """
+    Shared archive writer for config.STROKE_ARCHIVE, opened on first use
+    Returns: StrokeArchiveWriter, or None if the archive could not be opened
+    """
+    global _stroke_archive
+    if _stroke_archive is None:
+        try:
+            _stroke_archive = StrokeArchiveWriter(config.STROKE_ARCHIVE)
+        except (OSError, ValueError) as e:
+            print(f"Could not open stroke archive: {e}")
+            _stroke_archive = False
+    return _stroke_archive or None
+
+
+def close_stroke_archive():
+    """Write the index and close the shared archive, if it was opened"""
+    global _stroke_archive
+    if _stroke_archive:
+        try:
+            _stroke_archive.close()
+        except OSError as e:
+            print(f"Could not close stroke archive: {e}")
+    _stroke_archive = None
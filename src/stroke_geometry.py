@@ -0,0 +1,213 @@
+"""
+Stroke Geometry - Polyline helpers shared by tracing, scoring and rendering
+"""
+import math
+import numpy as np
+
+
+def stroke_length(stroke):
+    """Get the total arc length of a polyline"""
+    if len(stroke) < 2:
+        return 0.0
+    points = np.asarray(stroke, dtype=float)
+    return float(np.hypot(*np.diff(points, axis=0).T).sum())
+
+
+def cumulative_lengths(stroke):
+    """
+    Get arc length from the start of the polyline to every vertex
+    Returns: float array with one entry per vertex, starting at 0
+    """
+    points = np.asarray(stroke, dtype=float).reshape(-1, 2)
+    if len(points) < 2:
+        return np.zeros(len(points))
+    segment_lengths = np.hypot(*np.diff(points, axis=0).T)
+    return np.concatenate(([0.0], np.cumsum(segment_lengths)))
+
+
+def resample_stroke(stroke, spacing):
+    """
+    Resample a polyline to evenly spaced points along its arc length
+    Both endpoints are kept; the actual spacing is at most `spacing`.
+    Returns: list of (x, y) tuples
+    """
+    if len(stroke) < 2 or spacing <= 0:
+        return [tuple(p) for p in stroke]
+    
+    total = stroke_length(stroke)
+    if total == 0:
+        return [tuple(stroke[0])]
+    return resample_stroke_count(stroke, max(1, math.ceil(total / spacing)) + 1)
+
+
+def resample_stroke_count(stroke, count):
+    """
+    Resample a polyline to exactly `count` points evenly spaced by arc length
+    A one-point or zero-length stroke repeats its first point.
+    Returns: list of (x, y) tuples
+    """
+    if len(stroke) == 0 or count <= 0:
+        return []
+    
+    points = np.asarray(stroke, dtype=float).reshape(-1, 2)
+    distances = cumulative_lengths(points)
+    total = distances[-1]
+    if total == 0:
+        return [tuple(points[0])] * count
+    
+    targets = np.linspace(0.0, total, count)
+    xs = np.interp(targets, distances, points[:, 0])
+    ys = np.interp(targets, distances, points[:, 1])
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def dash_polylines(stroke, dash_length, gap_length):
+    """
+    Split a polyline into dashes with one continuous dash pattern
+    The pattern runs along the whole stroke instead of restarting at every
+    vertex, and each dash keeps the vertices inside it so it follows curves.
+    Returns: list of dashes, each a list of [x, y] points
+    """
+    points = np.asarray(stroke, dtype=float).reshape(-1, 2)
+    if len(points) < 2 or dash_length <= 0:
+        return []
+    distances = cumulative_lengths(points)
+    total = distances[-1]
+    if total == 0:
+        return []
+    period = dash_length + max(gap_length, 0)
+    
+    starts = np.arange(0.0, total, period)
+    ends = np.minimum(starts + dash_length, total)
+    
+    # Vertices strictly inside a dash become corners of that dash
+    dash_index = np.floor(distances / period)
+    phase = distances - dash_index * period
+    inside = (phase > 0) & (phase < dash_length) & (distances < total)
+    
+    # Arc positions of every dash point, sorted along the stroke; dashes do
+    # not overlap, so sorting keeps each dash's points together and in order
+    positions = np.sort(np.concatenate((starts, ends, distances[inside])))
+    coords = np.column_stack((np.interp(positions, distances, points[:, 0]),
+                              np.interp(positions, distances, points[:, 1]))).tolist()
+    
+    sizes = np.bincount(dash_index[inside].astype(int), minlength=len(starts))[:len(starts)] + 2
+    bounds = [0] + np.cumsum(sizes).tolist()
+    return [coords[first:last] for first, last in zip(bounds[:-1], bounds[1:])]
+
+
+def simplify_stroke(stroke, epsilon):
+    """
+    Drop vertices that lie within `epsilon` of the simplified polyline
+    (Ramer-Douglas-Peucker). Straight runs collapse to their endpoints.
+    Returns: list of (x, y) tuples
+    """
+    if len(stroke) < 3:
+        return [tuple(p) for p in stroke]
+    
+    points = np.asarray(stroke, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    pending = [(0, len(points) - 1)]
+    while pending:
+        first, last = pending.pop()
+        if last - first < 2:
+            continue
+        segment = points[last] - points[first]
+        offsets = points[first + 1:last] - points[first]
+        length = math.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        index = int(np.argmax(distances))
+        if distances[index] > epsilon:
+            split = first + 1 + index
+            keep[split] = True
+            pending.append((first, split))
+            pending.append((split, last))
+    return [tuple(p) for p in points[keep].tolist()]
+
+
+def stroke_segments(strokes):
+    """
+    Collect the segments of one or more polylines into a single array
+    A one-point stroke becomes a zero-length segment.
+    Returns: float array of shape (M, 4) holding x1, y1, x2, y2
+    """
+    segments = []
+    for stroke in strokes:
+        points = np.asarray(stroke, dtype=float).reshape(-1, 2)
+        if len(points) == 0:
+            continue
+        if len(points) == 1:
+            points = np.vstack((points, points))
+        segments.append(np.hstack((points[:-1], points[1:])))
+    if not segments:
+        return np.empty((0, 4))
+    return np.vstack(segments)
+
+
+def point_to_segments_distance(points, segments):
+    """
+    Get the distance from each point to the nearest of the given segments
+    points: sequence of (x, y); segments: array from stroke_segments()
+    Returns: float array with one distance per point (inf if no segments)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(segments) == 0:
+        return np.full(len(points), np.inf)
+    
+    starts = segments[:, :2]
+    directions = segments[:, 2:] - starts
+    length_sq = (directions ** 2).sum(axis=1)
+    safe_length_sq = np.where(length_sq == 0, 1.0, length_sq)
+    
+    # (N, M) projection of every point onto every segment, clamped to the segment
+    offsets = points[:, None, :] - starts[None, :, :]
+    t = (offsets * directions[None, :, :]).sum(axis=2) / safe_length_sq
+    t = np.clip(t, 0.0, 1.0)
+    nearest = starts[None, :, :] + t[:, :, None] * directions[None, :, :]
+    distances = np.hypot(*(points[:, None, :] - nearest).transpose(2, 0, 1))
+    return distances.min(axis=1)
+
+
+def covered_length(segments, points, tolerance):
+    """
+    Get the arc length of the segments lying within `tolerance` of any point
+    Each point covers the chord a circle of radius `tolerance` cuts from a
+    segment; overlapping chords on the same segment are merged.
+    Returns: (covered_length, total_length)
+    """
+    if len(segments) == 0:
+        return 0.0, 0.0
+    
+    starts = segments[:, :2]
+    directions = segments[:, 2:] - starts
+    lengths = np.hypot(directions[:, 0], directions[:, 1])
+    total = float(lengths.sum())
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) == 0 or total == 0:
+        return 0.0, total
+    
+    units = directions / np.where(lengths == 0, 1.0, lengths)[:, None]
+    
+    # (N, M) chord of each point's tolerance circle along each segment
+    offsets = points[:, None, :] - starts[None, :, :]
+    along = (offsets * units[None, :, :]).sum(axis=2)
+    perpendicular_sq = (offsets ** 2).sum(axis=2) - along ** 2
+    half_chord = np.sqrt(np.clip(tolerance ** 2 - perpendicular_sq, 0.0, None))
+    hits = perpendicular_sq <= tolerance ** 2
+    # Misses become empty intervals at 0, which never add length
+    chord_starts = np.where(hits, np.clip(along - half_chord, 0.0, lengths), 0.0)
+    chord_ends = np.where(hits, np.clip(along + half_chord, 0.0, lengths), 0.0)
+    
+    # Union of intervals per segment: sort by start, subtract overlap with
+    # the furthest end seen so far
+    order = np.argsort(chord_starts, axis=0)
+    chord_starts = np.take_along_axis(chord_starts, order, axis=0)
+    chord_ends = np.take_along_axis(chord_ends, order, axis=0)
+    reached = np.maximum.accumulate(chord_ends, axis=0)
+    previous = np.vstack((np.zeros((1, len(segments))), reached[:-1]))
+    gained = np.clip(chord_ends - np.maximum(chord_starts, previous), 0.0, None)
+    return float(gained.sum()), total
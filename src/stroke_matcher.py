@@ -0,0 +1,62 @@
+"""
+Stroke Matcher - Checks each user stroke against the guide stroke expected at that position
+"""
+import numpy as np
+import config
+from src.stroke_geometry import resample_stroke_count
+
+
+# Feedback for a finished user stroke
+STROKE_CORRECT = 'correct'
+STROKE_REVERSED = 'reversed'  # Right stroke, drawn from the wrong end
+STROKE_OUT_OF_ORDER = 'out_of_order'  # Matches a different guide stroke
+STROKE_OFF = 'off'  # Does not match any guide stroke
+STROKE_EXTRA = 'extra'  # More strokes than the character has
+
+
+class StrokeMatcher:
+    """Aligns user strokes with ordered, directed guide strokes"""
+    
+    def __init__(self, guide_strokes, tolerance=None, samples=None):
+        """
+        guide_strokes: list of screen-space polylines in the intended writing order
+        tolerance: mean distance (pixels) under which two strokes are considered the same
+        samples: number of arc-length samples compared per stroke
+        """
+        self.tolerance = tolerance if tolerance is not None else config.TRACING_TOLERANCE
+        self.samples = samples or config.STROKE_MATCH_SAMPLES
+        self.guide_profiles = [self._profile(stroke) for stroke in guide_strokes]
+    
+    def _profile(self, stroke):
+        """Resample a stroke so profiles can be compared point for point"""
+        return np.asarray(resample_stroke_count(stroke, self.samples), dtype=float).reshape(-1, 2)
+    
+    def _mean_distance(self, profile, guide_profile):
+        """Mean distance between corresponding samples of two profiles"""
+        if len(profile) == 0 or len(guide_profile) == 0:
+            return float('inf')
+        return float(np.hypot(*(profile - guide_profile).T).mean())
+    
+    def classify(self, index, user_stroke):
+        """
+        Compare a finished user stroke with the guide stroke expected at `index`
+        Returns: one of the STROKE_* feedback values
+        """
+        if index >= len(self.guide_profiles):
+            return STROKE_EXTRA
+        
+        profile = self._profile(user_stroke)
+        expected = self.guide_profiles[index]
+        if self._mean_distance(profile, expected) <= self.tolerance:
+            return STROKE_CORRECT
+        if self._mean_distance(profile, expected[::-1]) <= self.tolerance:
+            return STROKE_REVERSED
+        
+        for other_index, other in enumerate(self.guide_profiles):
+            if other_index == index:
+                continue
+            if (self._mean_distance(profile, other) <= self.tolerance or
+                    self._mean_distance(profile, other[::-1]) <= self.tolerance):
+                return STROKE_OUT_OF_ORDER
+        
+        return STROKE_OFF
@@ -0,0 +1,118 @@
+"""
+Stroke Renderer - Anti-aliased thick polylines with round joins and caps
+
+A polyline is drawn as one shape: every pixel near it gets its distance to
+the closest segment, and that distance sets how much of the pixel is covered.
+Joints are therefore filled without gaps or overlapping edges, and the
+outline is smoothed over one pixel. Works on any 24 or 32-bit surface
+through pygame.surfarray; on transparent layers the coverage of earlier
+calls is kept, so ink can be extended point by point.
+"""
+import math
+import numpy as np
+import pygame
+
+
+def _capsule_distance(xs, ys, start, end):
+    """
+    Distance from pixel centers to a segment
+    xs: (W, 1) column of x coordinates; ys: (1, H) row of y coordinates
+    Returns: (W, H) float array
+    """
+    ax, ay = start
+    dx = end[0] - ax
+    dy = end[1] - ay
+    length_sq = dx * dx + dy * dy
+    rel_x = xs - ax
+    rel_y = ys - ay
+    if length_sq == 0:
+        return np.hypot(rel_x, rel_y)
+    t = np.clip((rel_x * dx + rel_y * dy) / length_sq, 0.0, 1.0)
+    return np.hypot(rel_x - t * dx, rel_y - t * dy)
+
+
+def polyline_coverage(points, width, rect):
+    """
+    How much of each pixel in `rect` a thick polyline covers
+    points: (x, y) positions, with pixel (x, y) centered on integer coordinates
+    width: line width in pixels
+    rect: pygame.Rect of the pixels to compute
+    Returns: (rect.width, rect.height) float32 array of coverage from 0 to 1,
+    indexed [x, y] like pygame.surfarray
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    reach = width / 2 + 1
+    distance = np.full(rect.size, np.inf, dtype=np.float32)
+    if len(points) == 0 or rect.width <= 0 or rect.height <= 0:
+        return np.zeros(rect.size, dtype=np.float32)
+    
+    # A single point is drawn as a dot
+    starts = points[:-1] if len(points) > 1 else points
+    ends = points[1:] if len(points) > 1 else points
+    for start, end in zip(starts, ends):
+        # Only the pixels within reach of this segment can change
+        left = max(int(math.floor(min(start[0], end[0]) - reach)), rect.left)
+        right = min(int(math.ceil(max(start[0], end[0]) + reach)) + 1, rect.right)
+        top = max(int(math.floor(min(start[1], end[1]) - reach)), rect.top)
+        bottom = min(int(math.ceil(max(start[1], end[1]) + reach)) + 1, rect.bottom)
+        if left >= right or top >= bottom:
+            continue
+        xs = np.arange(left, right, dtype=np.float32)[:, None]
+        ys = np.arange(top, bottom, dtype=np.float32)[None, :]
+        window = distance[left - rect.left:right - rect.left, top - rect.top:bottom - rect.top]
+        np.minimum(window, _capsule_distance(xs, ys, start, end), out=window)
+    
+    # Full coverage inside the line, fading to none over the last pixel
+    return np.clip(width / 2 + 0.5 - distance, 0.0, 1.0)
+
+
+def polyline_rect(points, width):
+    """Bounding rect of the pixels a thick polyline can touch"""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) == 0:
+        return pygame.Rect(0, 0, 0, 0)
+    reach = width / 2 + 1
+    left = int(math.floor(points[:, 0].min() - reach))
+    top = int(math.floor(points[:, 1].min() - reach))
+    right = int(math.ceil(points[:, 0].max() + reach)) + 1
+    bottom = int(math.ceil(points[:, 1].max() + reach)) + 1
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def draw_polyline(surface, color, points, width):
+    """
+    Draw an anti-aliased polyline with round joins and caps in one pass
+    color: RGB or RGBA; points: (x, y) positions; width: line width in pixels
+    Returns: pygame.Rect of the surface area that was drawn on
+    """
+    rect = polyline_rect(points, width).clip(surface.get_rect())
+    if rect.width == 0 or rect.height == 0:
+        return rect
+    
+    coverage = polyline_coverage(points, width, rect)
+    color = pygame.Color(color)
+    alpha = coverage * (color.a / 255)
+    src = np.array([color.r, color.g, color.b], dtype=np.float32)
+    
+    pixels = pygame.surfarray.pixels3d(surface)
+    region = (slice(rect.left, rect.right), slice(rect.top, rect.bottom))
+    try:
+        rgb = pixels[region].astype(np.float32)
+        if surface.get_flags() & pygame.SRCALPHA:
+            # Keep the larger coverage, so a line continued over several calls
+            # matches one drawn in a single call
+            dest_alpha_view = pygame.surfarray.pixels_alpha(surface)
+            try:
+                dest_alpha = dest_alpha_view[region] / 255.0
+                out_alpha = np.maximum(alpha, dest_alpha)
+                weight = np.divide(alpha, out_alpha, out=np.zeros_like(alpha), where=out_alpha > 0)
+                rgb += (src - rgb) * weight[..., None]
+                dest_alpha_view[region] = np.rint(out_alpha * 255).astype(np.uint8)
+            finally:
+                del dest_alpha_view
+        else:
+            rgb += (src - rgb) * alpha[..., None]
+        pixels[region] = np.rint(rgb).astype(np.uint8)
+    finally:
+        del pixels  # Unlock the surface
+    return rect
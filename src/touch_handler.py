@@ -15,17 +15,20 @@ class TouchHandler:
         self.current_pos = None
         self.touch_path = []  # List of (x, y) tuples
         self.last_touch_pos = None
-        
+    
     def handle_event(self, event):
         """
         Process a pygame event and update touch state
         Returns: (event_handled, touch_data)
         """
+        now = pygame.time.get_ticks()
         touch_data = {
             'is_touching': self.is_touching,
             'position': self.current_pos,
             'path': self.touch_path.copy(),
-            'start_pos': self.touch_start_pos
+            'start_pos': self.touch_start_pos,
+            'stroke_ended': False,
+            'time': now  # Milliseconds, on the pygame.time.get_ticks() clock
         }
         
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -39,14 +42,17 @@ class TouchHandler:
                 touch_data['position'] = self.current_pos
                 touch_data['start_pos'] = self.touch_start_pos
                 return True, touch_data
-                
+        
         elif event.type == pygame.MOUSEBUTTONUP:
             if event.button == 1:
+                was_touching = self.is_touching
                 self.is_touching = False
                 touch_data['is_touching'] = False
-                # Keep the path for processing
+                # Keep the path for processing; the screen closes it off as a stroke
+                if was_touching and self.touch_path:
+                    touch_data['stroke_ended'] = True
                 return True, touch_data
-                
+        
         elif event.type == pygame.MOUSEMOTION:
             if self.is_touching:
                 current_pos = event.pos
@@ -0,0 +1,133 @@
+"""
+Touch Input - Reads a Linux evdev touchscreen when SDL has no input of its own
+
+On Lite images without X, the framebuffer backend runs SDL with the dummy
+video driver, which delivers no mouse or touch events. This module reads
+the touchscreen's /dev/input/event* device directly and posts the same
+MOUSEBUTTONDOWN / MOUSEMOTION / MOUSEBUTTONUP events SDL would, scaled to
+the frame size, so the screens need no changes.
+
+Events are read without blocking once per frame (see DisplayManager.update)
+and arrive with the next pygame.event.get().
+"""
+import fcntl
+import os
+import struct
+import pygame
+
+
+# struct input_event: timeval (two native longs), type, code, value
+INPUT_EVENT = struct.Struct('llHHi')
+# struct input_absinfo: value, minimum, maximum, fuzz, flat, resolution
+ABS_INFO = struct.Struct('6i')
+
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+SYN_REPORT = 0
+BTN_TOUCH = 0x14a
+ABS_X = 0x00
+ABS_Y = 0x01
+ABS_MT_POSITION_X = 0x35
+ABS_MT_POSITION_Y = 0x36
+ABS_MT_TRACKING_ID = 0x39
+
+
+def _eviocgabs(axis):
+    """ioctl request number for EVIOCGABS(axis): _IOR('E', 0x40 + axis, struct input_absinfo)"""
+    return (2 << 30) | (ABS_INFO.size << 16) | (ord('E') << 8) | (0x40 + axis)
+
+
+class EvdevTouch:
+    """Single-touch input from an evdev device, turned into pygame mouse events"""
+    
+    def __init__(self, path, size, swap_xy=False, invert_x=False, invert_y=False):
+        """
+        path: evdev device, e.g. /dev/input/event0 or a udev symlink to it
+        size: (width, height) of the frames the touch positions are scaled to
+        swap_xy, invert_x, invert_y: match the panel's orientation to the touch axes
+        Raises OSError if the device cannot be opened
+        """
+        self.fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self.size = size
+        self.swap_xy = swap_xy
+        self.invert_x = invert_x
+        self.invert_y = invert_y
+        self.ranges = {axis: self._range(axis) for axis in (ABS_X, ABS_Y)}
+        self.raw = [0, 0]  # Last raw (x, y)
+        self.touching = False  # Finger down as of the last SYN_REPORT
+        self.down = False  # Finger down as reported since then
+        self.pos = None  # Last posted screen position
+        self._pending = b''  # Partial event left over from the last read
+    
+    def _range(self, axis):
+        """(minimum, maximum) of an absolute axis, or the frame size if the device does not say"""
+        try:
+            info = fcntl.ioctl(self.fd, _eviocgabs(axis), bytes(ABS_INFO.size))
+            _, minimum, maximum, _, _, _ = ABS_INFO.unpack(info)
+        except OSError:
+            minimum, maximum = 0, 0
+        if maximum <= minimum:
+            return 0, self.size[axis] - 1
+        return minimum, maximum
+    
+    def _screen_position(self):
+        """Scale the raw position to frame pixels"""
+        fractions = []
+        for axis in (ABS_X, ABS_Y):
+            minimum, maximum = self.ranges[axis]
+            fractions.append(min(max((self.raw[axis] - minimum) / (maximum - minimum), 0.0), 1.0))
+        x, y = fractions
+        if self.swap_xy:
+            x, y = y, x
+        if self.invert_x:
+            x = 1.0 - x
+        if self.invert_y:
+            y = 1.0 - y
+        width, height = self.size
+        return int(round(x * (width - 1))), int(round(y * (height - 1)))
+    
+    def poll(self):
+        """Read the events waiting on the device and post them as pygame events"""
+        try:
+            data = self._pending + os.read(self.fd, INPUT_EVENT.size * 64)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print(f"Could not read touch input: {e}")
+            return
+        usable = len(data) - len(data) % INPUT_EVENT.size
+        self._pending = data[usable:]
+        for _, _, event_type, code, value in INPUT_EVENT.iter_unpack(data[:usable]):
+            if event_type == EV_ABS:
+                if code in (ABS_X, ABS_MT_POSITION_X):
+                    self.raw[ABS_X] = value
+                elif code in (ABS_Y, ABS_MT_POSITION_Y):
+                    self.raw[ABS_Y] = value
+                elif code == ABS_MT_TRACKING_ID:
+                    self.down = value >= 0
+            elif event_type == EV_KEY and code == BTN_TOUCH:
+                self.down = value != 0
+            elif event_type == EV_SYN and code == SYN_REPORT:
+                self._report()
+    
+    def _report(self):
+        """Post the mouse event for one complete touch report"""
+        pos = self._screen_position()
+        if self.down and not self.touching:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos, touch=True))
+        elif self.down and pos != self.pos:
+            rel = (pos[0] - self.pos[0], pos[1] - self.pos[1])
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel,
+                                                 buttons=(1, 0, 0), touch=True))
+        elif not self.down and self.touching:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=self.pos, touch=True))
+        self.touching = self.down
+        if self.down:
+            self.pos = pos
+    
+    def close(self):
+        """Close the device"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
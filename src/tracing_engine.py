@@ -2,228 +2,461 @@
 Tracing Engine - Core tracing logic, validation, and rendering
 """
 import pygame
-import math
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import config
+from src.layout import get_layout
+from src.stroke_geometry import (
+    covered_length,
+    dash_polylines,
+    point_to_segments_distance,
+    resample_stroke,
+    simplify_stroke,
+    stroke_segments,
+)
+from src.stroke_matcher import StrokeMatcher, STROKE_REVERSED
+from src.stroke_renderer import draw_polyline
+from src.stroke_similarity import stroke_similarity
+
+
+_scoring_executor = None
+
+
+def _get_scoring_executor():
+    """Shared single-thread executor for ASYNC_SCORING, started on first use"""
+    global _scoring_executor
+    if _scoring_executor is None:
+        _scoring_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scoring')
+    return _scoring_executor
+
+
+def fit_strokes(strokes, area, padding):
+    """
+    Scale normalized (0-100) strokes to fit and center inside a screen rect
+    area: pygame.Rect the character is drawn in; padding: pixels kept clear at each side
+    Returns: list of screen-space strokes (lists of (x, y) tuples)
+    """
+    all_points = [point for stroke in strokes for point in stroke]
+    if not all_points:
+        return []
+    
+    min_x = min(p[0] for p in all_points)
+    max_x = max(p[0] for p in all_points)
+    min_y = min(p[1] for p in all_points)
+    max_y = max(p[1] for p in all_points)
+    
+    # Calculate scale to fit in display area with padding
+    char_width = max_x - min_x
+    char_height = max_y - min_y
+    
+    scale_x = (area.width - 2 * padding) / max(char_width, 1)
+    scale_y = (area.height - 2 * padding) / max(char_height, 1)
+    scale_factor = min(scale_x, scale_y)
+    
+    # Center the character
+    scaled_width = char_width * scale_factor
+    scaled_height = char_height * scale_factor
+    
+    offset_x = area.x + (area.width - scaled_width) // 2 - min_x * scale_factor
+    offset_y = area.y + (area.height - scaled_height) // 2 - min_y * scale_factor
+    
+    return [
+        [(x * scale_factor + offset_x, y * scale_factor + offset_y) for x, y in stroke]
+        for stroke in strokes
+    ]
 
 
 class TracingEngine:
     """Handles character tracing, validation, and visual feedback"""
     
-    def __init__(self, screen, character_data):
+    def __init__(self, screen, character_data, scaled_strokes=None, guide_layer=None):
         """
         Initialize tracing engine
         character_data: dict with 'strokes' (list of paths), 'name', 'pronunciation'
+        scaled_strokes: strokes already fitted to this screen (e.g. from the asset cache)
+        guide_layer: pre-drawn guide surface matching get_guide_layer_rect()
         """
         self.screen = screen
         self.character_data = character_data
         self.user_path = []  # List of (x, y) tuples from user drawing
+        self.user_strokes = []  # The same points, split into strokes at touch release
+        self.stroke_active = False  # True while the last user stroke is still being drawn
+        self.stroke_feedback = []  # StrokeMatcher result for each finished user stroke
+        self.stroke_similarities = []  # DTW shape match (0-1) for each finished user stroke
         self.scaled_guide_paths = []
-        self.scale_factor = 1.0
-        self.offset_x = 0
-        self.offset_y = 0
+        self.guide_layer = guide_layer  # Dashed guide lines, drawn once
+        self.guide_samples = []  # Evenly spaced guide points along each stroke
+        self.guide_segments = stroke_segments([])  # Simplified guide segments used for scoring
+        self.guide_stroke_segments = []  # The same segments, one array per guide stroke
+        self.guide_stroke_lengths = []  # Arc length of each guide stroke
+        self.stroke_matcher = StrokeMatcher([])
+        self.user_segment_distances = []  # Per user stroke, distance from each segment to the guide
         self.completion_percentage = 0.0
         self.is_complete = False
+        self.shape_score = 0.0
+        self._scoring_future = None  # Running background scoring job (ASYNC_SCORING)
+        self._scoring_dirty = False  # Drawing changed since the last job was submitted
+        self.ink_layer = None  # User strokes drawn so far, created on first render
+        self._ink_drawn = []  # Per user stroke, (points drawn, segment colors drawn) on ink_layer
+        self._ink_valid = False  # False when ink_layer must be redrawn from scratch
+        self._ink_rect = pygame.Rect(0, 0, 0, 0)  # Area of ink_layer that has ink on it
         
-        # Calculate display area (center of screen, leaving space for UI)
-        screen_width, screen_height = config.SCREEN_WIDTH, config.SCREEN_HEIGHT
-        self.display_area_size = config.CHARACTER_DISPLAY_SIZE
-        self.display_x = (screen_width - self.display_area_size) // 2
-        # Adjust Y position for smaller screen (account for title and buttons)
-        self.display_y = 50  # Start below title/pronunciation
+        # Display area (center of screen, below title/pronunciation)
+        self.layout = get_layout(screen.get_size())
         
-        self._prepare_guide_paths()
+        self._prepare_guide_paths(scaled_strokes)
+        if self.guide_layer is None:
+            self.guide_layer = self.build_guide_layer()
     
-    def _prepare_guide_paths(self):
+    def _prepare_guide_paths(self, scaled_strokes=None):
         """Scale and position guide paths for display"""
         if not self.character_data or 'strokes' not in self.character_data:
             return
         
-        # Find bounding box of character (assuming normalized 0-100 coordinates)
-        all_points = []
-        for stroke in self.character_data['strokes']:
-            all_points.extend(stroke)
-        
-        if not all_points:
+        if scaled_strokes is None:
+            scaled_strokes = fit_strokes(
+                self.character_data['strokes'], self.layout.character_area, self.layout.px(10)
+            )
+        self.scaled_guide_paths = [
+            [tuple(point) for point in np.asarray(stroke, dtype=float).reshape(-1, 2).tolist()]
+            for stroke in scaled_strokes
+        ]
+        if not self.scaled_guide_paths:
             return
         
-        min_x = min(p[0] for p in all_points)
-        max_x = max(p[0] for p in all_points)
-        min_y = min(p[1] for p in all_points)
-        max_y = max(p[1] for p in all_points)
-        
-        # Calculate scale to fit in display area with padding
-        padding = 10
-        char_width = max_x - min_x
-        char_height = max_y - min_y
-        
-        scale_x = (self.display_area_size - 2 * padding) / max(char_width, 1)
-        scale_y = (self.display_area_size - 2 * padding) / max(char_height, 1)
-        self.scale_factor = min(scale_x, scale_y)
-        
-        # Center the character
-        scaled_width = char_width * self.scale_factor
-        scaled_height = char_height * self.scale_factor
+        # Resample once so point-based matching sees uniform density on every stroke
+        self.guide_samples = [
+            resample_stroke(stroke, self.layout.guide_sample_spacing)
+            for stroke in self.scaled_guide_paths
+        ]
         
-        self.offset_x = self.display_x + (self.display_area_size - scaled_width) // 2 - min_x * self.scale_factor
-        self.offset_y = self.display_y + (self.display_area_size - scaled_height) // 2 - min_y * self.scale_factor
+        # Scoring measures distance to segments, so only the corners matter
+        self.guide_stroke_segments = [
+            stroke_segments([simplify_stroke(stroke, config.GUIDE_SIMPLIFY_TOLERANCE)])
+            for stroke in self.scaled_guide_paths
+        ]
+        self.guide_segments = stroke_segments([])
+        if self.guide_stroke_segments:
+            self.guide_segments = np.vstack(self.guide_stroke_segments)
+        self.guide_stroke_lengths = [
+            float(np.hypot(segments[:, 2] - segments[:, 0], segments[:, 3] - segments[:, 1]).sum())
+            for segments in self.guide_stroke_segments
+        ]
         
-        # Scale all guide paths
-        self.scaled_guide_paths = []
-        for stroke in self.character_data['strokes']:
-            scaled_stroke = [
-                (x * self.scale_factor + self.offset_x, y * self.scale_factor + self.offset_y)
-                for x, y in stroke
-            ]
-            self.scaled_guide_paths.append(scaled_stroke)
+        # Strokes are written in the order and direction the data lists them
+        self.stroke_matcher = StrokeMatcher(self.scaled_guide_paths, self.layout.tracing_tolerance)
     
     def add_user_point(self, x, y):
-        """Add a point to the user's drawing path"""
+        """Add a point to the stroke currently being drawn"""
+        if not self.stroke_active:
+            self.user_strokes.append([])
+            self.stroke_active = True
+        self.user_strokes[-1].append((x, y))
         self.user_path.append((x, y))
         self._validate_path()
     
-    def set_user_path(self, path):
-        """Set the entire user path"""
-        self.user_path = path.copy() if path else []
+    def end_stroke(self):
+        """Finish the stroke being drawn; its order, direction and shape are checked with the score"""
+        if not self.stroke_active:
+            return
+        self.stroke_active = False
+        self._validate_path()
+    
+    def set_user_strokes(self, strokes):
+        """Replace the drawing with a list of finished strokes"""
+        self.user_strokes = [list(stroke) for stroke in strokes if stroke]
+        self.user_path = [point for stroke in self.user_strokes for point in stroke]
+        self.stroke_active = False
+        self._ink_valid = False
+        self.stroke_feedback = []
+        self.stroke_similarities = []
+        self._update_shape_score()
+        # A job still running scores the old drawing; drop its result
+        self._scoring_future = None
         self._validate_path()
     
+    def set_user_path(self, path):
+        """Set the entire user path as a single stroke"""
+        self.set_user_strokes([path] if path else [])
+    
     def clear_user_path(self):
         """Clear the user's drawing"""
         self.user_path = []
+        self.user_strokes = []
+        self.stroke_active = False
+        self.stroke_feedback = []
+        self.stroke_similarities = []
+        self.user_segment_distances = []
         self.completion_percentage = 0.0
         self.is_complete = False
+        self.shape_score = 0.0
+        self._ink_valid = False
+        # Any job still running scores the old drawing; drop its result
+        self._scoring_future = None
+        self._scoring_dirty = False
+    
+    def get_last_stroke_feedback(self):
+        """Get the StrokeMatcher result for the most recently finished stroke (None until it is scored)"""
+        if self.stroke_active or not self.stroke_feedback or len(self.stroke_feedback) < len(self.user_strokes):
+            return None
+        return self.stroke_feedback[-1]
+    
+    def get_shape_score(self):
+        """Get how closely the finished strokes follow the guide shapes (0-1)"""
+        return self.shape_score
+    
+    def _stroke_similarity(self, index, stroke):
+        """DTW shape match of a user stroke against the guide stroke it stands for"""
+        if index < len(self.guide_samples):
+            return stroke_similarity(stroke, self.guide_samples[index], self.layout.tracing_tolerance * 2,
+                                     self.layout.guide_sample_spacing)
+        return 0.0
+    
+    def _update_shape_score(self):
+        """Average stroke similarity over the guide strokes; missing strokes count as 0"""
+        if not self.guide_samples:
+            self.shape_score = 0.0
+            return
+        matched = self.stroke_similarities[:len(self.guide_samples)]
+        self.shape_score = sum(matched) / len(self.guide_samples)
+    
+    def _check_strokes(self, user_strokes, finished, stroke_feedback, stroke_similarities):
+        """
+        Order/direction feedback and DTW similarity for finished strokes not checked yet
+        finished: number of leading strokes in user_strokes that are finished
+        stroke_feedback, stroke_similarities: results already known, extended in place
+        """
+        for index in range(len(stroke_similarities), finished):
+            if config.STROKE_ORDER_CHECK:
+                stroke_feedback.append(self.stroke_matcher.classify(index, user_strokes[index]))
+            stroke_similarities.append(self._stroke_similarity(index, user_strokes[index]))
+    
+    def _target_segments(self, index):
+        """Guide segments the user stroke at `index` is measured against"""
+        if config.STROKE_ORDER_CHECK and index < len(self.guide_stroke_segments):
+            return self.guide_stroke_segments[index]
+        return self.guide_segments
+    
+    def _finished_strokes(self):
+        """Number of user strokes that are finished"""
+        return len(self.user_strokes) - (1 if self.stroke_active else 0)
     
     def _validate_path(self):
-        """Validate user path against guide paths and calculate completion"""
-        if not self.user_path or not self.scaled_guide_paths:
-            self.completion_percentage = 0.0
-            self.is_complete = False
+        """Validate user strokes against guide strokes and calculate completion"""
+        if not config.ASYNC_SCORING:
+            self._apply_score(self._score(self.user_strokes, self._finished_strokes(),
+                                          self.stroke_feedback, self.stroke_similarities))
             return
         
-        # Flatten all guide points
-        all_guide_points = []
-        for stroke in self.scaled_guide_paths:
-            all_guide_points.extend(stroke)
-        
-        if not all_guide_points:
+        # Hand the work to the scoring thread; render keeps the last result
+        self._scoring_dirty = True
+        self._submit_scoring()
+    
+    def _submit_scoring(self):
+        """Start a background scoring job if one is needed and none is running"""
+        if self._scoring_future is not None or not self._scoring_dirty:
             return
+        self._scoring_dirty = False
+        strokes = [list(stroke) for stroke in self.user_strokes]
+        self._scoring_future = _get_scoring_executor().submit(
+            self._score, strokes, self._finished_strokes(),
+            list(self.stroke_feedback), list(self.stroke_similarities)
+        )
+    
+    def update(self):
+        """Publish finished background scoring results (call once per frame)"""
+        if self._scoring_future is None or not self._scoring_future.done():
+            return
+        future = self._scoring_future
+        self._scoring_future = None
+        self._apply_score(future.result())
         
-        # For each user point, find closest guide point
-        correct_points = 0
-        total_guide_points = len(all_guide_points)
+        # Points that arrived while the job ran are scored in one new batch
+        self._submit_scoring()
+    
+    def is_scoring_pending(self):
+        """Check whether the published score lags behind the drawing"""
+        return self._scoring_future is not None or self._scoring_dirty
+    
+    def _apply_score(self, score):
+        """Publish a result from _score()"""
+        (self.completion_percentage, self.is_complete, self.user_segment_distances,
+         self.stroke_feedback, self.stroke_similarities) = score
+        self._update_shape_score()
+    
+    def _score(self, user_strokes, finished, stroke_feedback, stroke_similarities):
+        """
+        Score user strokes against the guide strokes
+        Finished strokes without feedback or similarity yet are checked first
+        (see _check_strokes). Reads only guide data that is fixed after
+        construction, so it is safe to run on the scoring thread.
+        Returns: (completion_percentage, is_complete, user_segment_distances,
+        stroke_feedback, stroke_similarities)
+        """
+        self._check_strokes(user_strokes, finished, stroke_feedback, stroke_similarities)
+        num_points = sum(len(stroke) for stroke in user_strokes)
+        if num_points == 0 or len(self.guide_segments) == 0:
+            return 0.0, False, [], stroke_feedback, stroke_similarities
         
-        for ux, uy in self.user_path:
-            min_distance = float('inf')
-            for gx, gy in all_guide_points:
-                distance = math.sqrt((ux - gx)**2 + (uy - gy)**2)
-                min_distance = min(min_distance, distance)
+        # Accuracy: user points that lie close to the guide stroke they belong to
+        correct_points = 0
+        user_segment_distances = []
+        tolerance = self.layout.tracing_tolerance
+        for index, stroke in enumerate(user_strokes):
+            segments = self._target_segments(index)
+            distances = point_to_segments_distance(stroke, segments)
+            correct_points += int(np.count_nonzero(distances <= tolerance))
             
-            if min_distance <= config.TRACING_TOLERANCE:
-                correct_points += 1
+            # Distance of each segment midpoint, used to color the ink
+            segment_distances = []
+            if len(stroke) > 1:
+                points = np.asarray(stroke, dtype=float)
+                midpoints = (points[:-1] + points[1:]) / 2
+                segment_distances = point_to_segments_distance(midpoints, segments).tolist()
+            user_segment_distances.append(segment_distances)
         
-        # Calculate percentage (user points that are close to guide)
-        if len(self.user_path) > 0:
-            accuracy = correct_points / len(self.user_path)
-        else:
-            accuracy = 0
-        
-        # Also check coverage of guide points
-        covered_guide_points = 0
-        for gx, gy in all_guide_points:
-            min_distance = float('inf')
-            for ux, uy in self.user_path:
-                distance = math.sqrt((ux - gx)**2 + (uy - gy)**2)
-                min_distance = min(min_distance, distance)
-            
-            if min_distance <= config.TRACING_TOLERANCE:
-                covered_guide_points += 1
+        accuracy = correct_points / num_points
         
-        coverage = covered_guide_points / total_guide_points if total_guide_points > 0 else 0
+        # Coverage: share of guide arc length the user has traced over
+        if config.STROKE_ORDER_CHECK:
+            # Each guide stroke only counts the user stroke drawn in its place,
+            # and only if it was not drawn backwards
+            covered = 0.0
+            total = sum(self.guide_stroke_lengths)
+            for index, stroke in enumerate(user_strokes[:len(self.guide_stroke_segments)]):
+                if index < len(stroke_feedback) and stroke_feedback[index] == STROKE_REVERSED:
+                    continue
+                covered += covered_length(
+                    self.guide_stroke_segments[index], stroke, tolerance
+                )[0]
+        else:
+            all_points = [point for stroke in user_strokes for point in stroke]
+            covered, total = covered_length(self.guide_segments, all_points, tolerance)
+        coverage = covered / total if total > 0 else 0
         
         # Combined score
-        self.completion_percentage = (accuracy * 0.5 + coverage * 0.5)
-        self.is_complete = self.completion_percentage >= config.TRACING_COMPLETION_THRESHOLD
+        completion_percentage = (accuracy * 0.5 + coverage * 0.5)
+        is_complete = completion_percentage >= config.TRACING_COMPLETION_THRESHOLD
+        return completion_percentage, is_complete, user_segment_distances, stroke_feedback, stroke_similarities
     
-    def _draw_dashed_line(self, surface, color, start_pos, end_pos, dash_length, gap_length):
-        """Draw a dashed line"""
-        x1, y1 = start_pos
-        x2, y2 = end_pos
+    def get_guide_layer_rect(self):
+        """Screen rect covered by the guide layer (character area plus line width)"""
+        width = self.layout.guide_line_width
+        return self.layout.character_area.inflate(2 * width, 2 * width)
+    
+    def build_guide_layer(self):
+        """Draw the dashed guide lines once onto a transparent surface"""
+        rect = self.get_guide_layer_rect()
+        layer = pygame.Surface(rect.size, pygame.SRCALPHA)
+        for stroke in self.scaled_guide_paths:
+            local_stroke = np.asarray(stroke, dtype=float).reshape(-1, 2) - rect.topleft
+            # One dash pattern along the whole stroke, one draw call per dash
+            for dash in dash_polylines(local_stroke, self.layout.dash_length, self.layout.dash_gap):
+                pygame.draw.lines(layer, config.COLOR_GUIDE_LINE, False, dash, self.layout.guide_line_width)
+        return layer
+    
+    def _segment_color(self, distance):
+        """Ink color for a user segment at a distance from the guide"""
+        if distance <= self.layout.tracing_tolerance:
+            return config.COLOR_CORRECT
+        elif distance <= self.layout.tracing_tolerance * 2:
+            return config.COLOR_USER_DRAWING
+        return config.COLOR_INCORRECT
+    
+    def _stroke_colors(self, index, stroke):
+        """Ink color of each segment of a user stroke (unscored segments use the plain ink color)"""
+        segment_distances = []
+        if index < len(self.user_segment_distances):
+            segment_distances = self.user_segment_distances[index]
+        return [
+            self._segment_color(segment_distances[i]) if i < len(segment_distances)
+            else config.COLOR_USER_DRAWING
+            for i in range(len(stroke) - 1)
+        ]
+    
+    def _update_ink_layer(self):
+        """
+        Bring the ink layer up to date with the user strokes
+        New points are drawn on top of the existing ink, and so are segments
+        whose color changed when a score was published; the layer is only
+        redrawn from scratch when the strokes were replaced.
+        """
+        if self.ink_layer is None:
+            self.ink_layer = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
         
-        distance = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-        if distance == 0:
-            return
+        colors = [self._stroke_colors(i, stroke) for i, stroke in enumerate(self.user_strokes)]
+        if len(self._ink_drawn) > len(colors):
+            self._ink_valid = False
+        if not self._ink_valid:
+            self.ink_layer.fill((0, 0, 0, 0))
+            self._ink_drawn = []
+            self._ink_rect = pygame.Rect(0, 0, 0, 0)
+            self._ink_valid = True
         
-        # Unit vector
-        dx = (x2 - x1) / distance
-        dy = (y2 - y1) / distance
-        
-        current_distance = 0
-        draw_dash = True
-        
-        while current_distance < distance:
-            if draw_dash:
-                end_dash = min(current_distance + dash_length, distance)
-                start_x = x1 + dx * current_distance
-                start_y = y1 + dy * current_distance
-                end_x = x1 + dx * end_dash
-                end_y = y1 + dy * end_dash
-                pygame.draw.line(surface, color, (start_x, start_y), (end_x, end_y), config.GUIDE_LINE_WIDTH)
-            
-            current_distance += dash_length + gap_length if draw_dash else gap_length
-            draw_dash = not draw_dash
+        for index, stroke in enumerate(self.user_strokes):
+            drawn_points, drawn_colors = self._ink_drawn[index] if index < len(self._ink_drawn) else (0, [])
+            if drawn_points == len(stroke) and drawn_colors == colors[index]:
+                continue
+            # Recolor runs of drawn segments whose color changed
+            for start, end in self._changed_runs(drawn_colors, colors[index]):
+                self._draw_ink(stroke[start:end + 1], colors[index][start:end])
+            if drawn_points < len(stroke):
+                # Start at the last point already drawn so the new ink joins it
+                start = max(drawn_points - 1, 0)
+                self._draw_ink(stroke[start:], colors[index][start:])
+            if index < len(self._ink_drawn):
+                self._ink_drawn[index] = (len(stroke), colors[index])
+            else:
+                self._ink_drawn.append((len(stroke), colors[index]))
+    
+    @staticmethod
+    def _changed_runs(old, new):
+        """(start, end) segment index ranges where two color lists differ, over the length of `old`"""
+        changed = [old[i] != new[i] for i in range(min(len(old), len(new)))]
+        runs = []
+        start = None
+        for i, is_changed in enumerate(changed + [False]):
+            if is_changed and start is None:
+                start = i
+            elif not is_changed and start is not None:
+                runs.append((start, i))
+                start = None
+        return runs
+    
+    def _draw_ink(self, points, colors):
+        """Draw part of a user stroke, one polyline per run of same-colored segments"""
+        rects = []
+        if len(points) == 1:
+            rects.append(draw_polyline(self.ink_layer, config.COLOR_USER_DRAWING, points,
+                                       self.layout.user_line_width))
+        start = 0
+        for end in range(1, len(colors) + 1):
+            if end == len(colors) or colors[end] != colors[start]:
+                rects.append(draw_polyline(self.ink_layer, colors[start], points[start:end + 1],
+                                           self.layout.user_line_width))
+                start = end
+        for rect in rects:
+            if rect.width and rect.height:
+                if self._ink_rect.width and self._ink_rect.height:
+                    self._ink_rect.union_ip(rect)
+                else:
+                    self._ink_rect = rect
     
     def render(self):
         """Render the tracing interface"""
-        # Draw guide lines (dashed)
-        for stroke in self.scaled_guide_paths:
-            if len(stroke) < 2:
-                continue
-            
-            for i in range(len(stroke) - 1):
-                self._draw_dashed_line(
-                    self.screen,
-                    config.COLOR_GUIDE_LINE,
-                    stroke[i],
-                    stroke[i + 1],
-                    config.DASH_LENGTH,
-                    config.DASH_GAP
-                )
-        
-        # Draw user path with color feedback
-        if len(self.user_path) > 1:
-            for i in range(len(self.user_path) - 1):
-                x1, y1 = self.user_path[i]
-                x2, y2 = self.user_path[i + 1]
-                
-                # Determine color based on proximity to guide
-                color = config.COLOR_USER_DRAWING
-                if self.scaled_guide_paths:
-                    # Check if this segment is close to any guide point
-                    mid_x = (x1 + x2) / 2
-                    mid_y = (y1 + y2) / 2
-                    
-                    min_distance = float('inf')
-                    for stroke in self.scaled_guide_paths:
-                        for gx, gy in stroke:
-                            distance = math.sqrt((mid_x - gx)**2 + (mid_y - gy)**2)
-                            min_distance = min(min_distance, distance)
-                    
-                    if min_distance <= config.TRACING_TOLERANCE:
-                        color = config.COLOR_CORRECT
-                    elif min_distance <= config.TRACING_TOLERANCE * 2:
-                        color = config.COLOR_USER_DRAWING
-                    else:
-                        color = config.COLOR_INCORRECT
-                
-                pygame.draw.line(self.screen, color, (x1, y1), (x2, y2), config.USER_LINE_WIDTH)
+        # Draw guide lines (dashed), pre-drawn on the guide layer
+        if self.guide_layer is not None:
+            self.screen.blit(self.guide_layer, self.get_guide_layer_rect())
+        
+        # Draw user strokes with color feedback, kept on the ink layer
+        self._update_ink_layer()
+        if self._ink_rect.width and self._ink_rect.height:
+            self.screen.blit(self.ink_layer, self._ink_rect, self._ink_rect)
         
         # Draw completion indicator
         if self.completion_percentage > 0:
-            # Progress bar at bottom (smaller for 3.5" screen)
-            bar_width = 150
-            bar_height = 12
-            bar_x = (config.SCREEN_WIDTH - bar_width) // 2
-            bar_y = config.SCREEN_HEIGHT - 50
+            # Progress bar at bottom
+            bar_x, bar_y, bar_width, bar_height = self.layout.progress_bar
             
             # Background
             pygame.draw.rect(self.screen, (200, 200, 200), (bar_x, bar_y, bar_width, bar_height))
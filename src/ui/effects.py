@@ -0,0 +1,153 @@
+"""
+Effects - Particle bursts and a fading banner for celebrations
+
+Particles live in a fixed-size pool of NumPy arrays: emitting reuses dead
+slots and every frame moves all of them with a few array operations. Their
+sprites are drawn once per color and fade step, and the banner text is
+rendered once per size, so a frame of effects is one blits() call and no
+font work.
+"""
+import numpy as np
+import pygame
+import config
+
+
+FADE_STEPS = 8  # Pre-rendered opacity levels per particle color
+PARTICLE_COLORS = (config.COLOR_SUCCESS, config.COLOR_PRIMARY, config.COLOR_SECONDARY,
+                   config.COLOR_DEMO_STROKE)
+PARTICLE_SPEED = (80, 220)  # Pixels per second at 480x320, random within this range
+PARTICLE_LIFE = (0.8, 1.6)  # Seconds, random within this range
+PARTICLE_GRAVITY = 300  # Pixels per second squared at 480x320
+BURSTS = ((0.0, 0.5, 32), (0.25, 0.25, 24), (0.5, 0.75, 24))  # (seconds, x as fraction of width, particles)
+
+_banner_cache = {}  # (text, font size, color) -> rendered surface
+
+
+def _particle_sprites(radius):
+    """Circles for every color and fade step: sprites[color][step], step 0 fully opaque"""
+    sprites = []
+    for color in PARTICLE_COLORS:
+        steps = []
+        for step in range(FADE_STEPS):
+            sprite = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+            alpha = int(255 * (1 - step / FADE_STEPS))
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+            steps.append(sprite)
+        sprites.append(steps)
+    return sprites
+
+
+def _banner(text, font_size, color):
+    """Text rendered once and reused by every celebration"""
+    key = (text, font_size, color)
+    surface = _banner_cache.get(key)
+    if surface is None:
+        font = pygame.font.Font(None, font_size)
+        surface = font.render(text, True, color)
+        _banner_cache[key] = surface
+    return surface
+
+
+class ParticlePool:
+    """Fixed number of particles stored in NumPy arrays; dead slots are reused"""
+    
+    def __init__(self, capacity, sprites):
+        """
+        capacity: most particles alive at once (extra emits are dropped)
+        sprites: from _particle_sprites()
+        """
+        self.sprites = sprites
+        self.radius = sprites[0][0].get_width() // 2
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.age = np.zeros(capacity)
+        self.life = np.zeros(capacity)  # 0 marks a free slot
+        self.color = np.zeros(capacity, dtype=int)
+        self.rng = np.random.default_rng()
+    
+    def alive(self):
+        """Boolean mask of live particles"""
+        return self.age < self.life
+    
+    def emit(self, origin, count, speed, life):
+        """
+        Launch particles from a point in random upward directions
+        speed, life: (low, high) ranges to pick from
+        """
+        free = np.flatnonzero(~self.alive())[:count]
+        n = len(free)
+        if n == 0:
+            return
+        angle = self.rng.uniform(np.radians(200), np.radians(340), n)  # Upwards, spread sideways
+        magnitude = self.rng.uniform(*speed, n)
+        self.position[free] = origin
+        self.velocity[free, 0] = np.cos(angle) * magnitude
+        self.velocity[free, 1] = np.sin(angle) * magnitude
+        self.age[free] = 0
+        self.life[free] = self.rng.uniform(*life, n)
+        self.color[free] = self.rng.integers(0, len(self.sprites), n)
+    
+    def update(self, dt, gravity):
+        """Move every live particle"""
+        live = self.alive()
+        self.velocity[live, 1] += gravity * dt
+        self.position[live] += self.velocity[live] * dt
+        self.age[live] += dt
+    
+    def draw(self, surface):
+        """Blit the live particles, faded by age"""
+        live = np.flatnonzero(self.alive())
+        if len(live) == 0:
+            return
+        steps = np.minimum((self.age[live] / self.life[live] * FADE_STEPS).astype(int), FADE_STEPS - 1)
+        corners = (self.position[live] - self.radius).astype(int).tolist()
+        sequence = [(self.sprites[color][step], corner)
+                    for color, step, corner in zip(self.color[live].tolist(), steps.tolist(), corners)]
+        surface.blits(sequence, doreturn=False)
+
+
+class EffectsEngine:
+    """Celebration effects for one screen"""
+    
+    def __init__(self, layout):
+        self.layout = layout
+        self.pool = ParticlePool(config.PARTICLE_POOL_SIZE, _particle_sprites(layout.px(4)))
+        self.banner = None  # Surface of the current banner text
+        self.time = None  # Seconds since celebrate(), None when idle
+        self.pending_bursts = []
+    
+    def celebrate(self, text="Great Job!"):
+        """Start the banner and the particle bursts"""
+        self.banner = _banner(text, self.layout.font_celebration, config.COLOR_SUCCESS)
+        self.time = 0.0
+        self.pending_bursts = list(BURSTS)
+    
+    def is_active(self):
+        """Check whether anything is still animating"""
+        return self.time is not None
+    
+    def update(self, dt):
+        """Advance the effects"""
+        if self.time is None:
+            return
+        self.time += dt
+        scale = self.layout.scale
+        while self.pending_bursts and self.pending_bursts[0][0] <= self.time:
+            _, x, count = self.pending_bursts.pop(0)
+            origin = (self.layout.width * x, self.layout.screen_center[1])
+            self.pool.emit(origin, count, (PARTICLE_SPEED[0] * scale, PARTICLE_SPEED[1] * scale),
+                           PARTICLE_LIFE)
+        self.pool.update(dt, PARTICLE_GRAVITY * scale)
+        if self.time >= config.CELEBRATION_DURATION and not self.pending_bursts and not self.pool.alive().any():
+            self.time = None
+    
+    def draw(self, surface):
+        """Draw the banner and particles"""
+        if self.time is None:
+            return
+        progress = min(self.time / config.CELEBRATION_DURATION, 1.0)
+        if progress < 1.0:
+            # Fade out from full opacity; the text itself is not re-rendered
+            self.banner.set_alpha(int(255 * (1 - progress)))
+            surface.blit(self.banner, self.banner.get_rect(center=self.layout.screen_center))
+        self.pool.draw(surface)
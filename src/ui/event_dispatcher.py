@@ -0,0 +1,125 @@
+"""
+Event Dispatcher - Routes pygame events only to the widgets they concern
+"""
+import pygame
+
+
+# Events that carry a pointer position and go to the widgets under it
+POINTER_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+INDEX_CELL_SIZE = 64  # Side of the square buckets the screen is divided into
+
+
+class SpatialIndex:
+    """Uniform grid of buckets for finding the rects that contain a point"""
+    
+    def __init__(self, cell_size=INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        self.buckets = {}  # (column, row) -> keys whose rects overlap that bucket
+        self.rects = {}  # Key -> pygame.Rect
+    
+    def _cells(self, rect):
+        """Buckets a rect overlaps"""
+        size = self.cell_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield column, row
+    
+    def insert(self, key, rect):
+        """Add a rect, or move it if the key is already indexed"""
+        self.remove(key)
+        rect = pygame.Rect(rect)
+        self.rects[key] = rect
+        if rect.width > 0 and rect.height > 0:
+            for cell in self._cells(rect):
+                self.buckets.setdefault(cell, []).append(key)
+    
+    def remove(self, key):
+        """Drop a key from the index (no-op if it is not there)"""
+        rect = self.rects.pop(key, None)
+        if rect is None or rect.width <= 0 or rect.height <= 0:
+            return
+        for cell in self._cells(rect):
+            bucket = self.buckets[cell]
+            bucket.remove(key)
+            if not bucket:
+                del self.buckets[cell]
+    
+    def query(self, pos):
+        """Keys whose rect contains a point"""
+        x, y = pos
+        bucket = self.buckets.get((int(x) // self.cell_size, int(y) // self.cell_size), ())
+        return [key for key in bucket if self.rects[key].collidepoint(pos)]
+
+
+class EventDispatcher:
+    """
+    Per-event-type subscriptions with hit testing for pointer events
+    Handlers subscribed with a rect only receive pointer events inside it;
+    handlers without one receive every event of their types. Handlers run in
+    subscription order until one returns a true value, which dispatch()
+    returns. A widget the pointer moves off still gets that motion event, so
+    it can clear its hover state.
+    """
+    
+    def __init__(self):
+        self.index = SpatialIndex()
+        self.regions = {}  # Token -> (handler, event types) for handlers with a rect
+        self.global_handlers = {}  # Event type -> list of (token, handler)
+        self.hovered = []  # Region tokens under the pointer at the last motion event
+        self._next_token = 0
+    
+    def subscribe(self, handler, event_types, rect=None):
+        """
+        Register a handler
+        handler: callable(event) returning a true value when it consumed the event
+        event_types: pygame event types the handler receives
+        rect: screen area for pointer events, or None to receive them anywhere
+        Returns: token for move() and unsubscribe()
+        """
+        token = self._next_token
+        self._next_token += 1
+        if rect is None:
+            for event_type in event_types:
+                self.global_handlers.setdefault(event_type, []).append((token, handler))
+        else:
+            self.regions[token] = (handler, frozenset(event_types))
+            self.index.insert(token, rect)
+        return token
+    
+    def move(self, token, rect):
+        """Update the area of a handler subscribed with a rect"""
+        if token in self.regions:
+            self.index.insert(token, rect)
+    
+    def unsubscribe(self, token):
+        """Remove a handler"""
+        if self.regions.pop(token, None) is not None:
+            self.index.remove(token)
+            return
+        for handlers in self.global_handlers.values():
+            handlers[:] = [(t, h) for t, h in handlers if t != token]
+    
+    def hit_test(self, pos):
+        """Check whether a point is over any widget subscribed with a rect"""
+        return bool(self.index.query(pos))
+    
+    def dispatch(self, event):
+        """
+        Deliver an event to the handlers that want it
+        Returns: the first true value a handler returned, or None
+        """
+        candidates = list(self.global_handlers.get(event.type, ()))
+        if event.type in POINTER_EVENTS:
+            under = [token for token in self.index.query(event.pos)
+                     if event.type in self.regions[token][1]]
+            if event.type == pygame.MOUSEMOTION:
+                left = [token for token in self.hovered if token not in under and token in self.regions]
+                self.hovered = under
+                under = under + left
+            candidates.extend((token, self.regions[token][0]) for token in under)
+        
+        for _, handler in sorted(candidates, key=lambda candidate: candidate[0]):
+            result = handler(event)
+            if result:
+                return result
+        return None
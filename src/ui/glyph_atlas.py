@@ -0,0 +1,141 @@
+"""
+Glyph Atlas - Characters rasterized once into a single surface for fast blitting
+"""
+import hashlib
+import json
+import os
+import pygame
+import config
+from src.asset_cache import cache_path
+
+
+ATLAS_VERSION = 1  # Bump when the atlas layout or file format changes
+ATLAS_MAX_WIDTH = 1024
+ATLAS_PADDING = 2
+
+# In-memory atlases, keyed by screen size and file name
+_atlases = {}
+
+
+class GlyphAtlas:
+    """A surface holding pre-rendered glyphs and the rect of each one"""
+    
+    def __init__(self, surface, index):
+        """
+        surface: surface with every glyph drawn on a transparent background
+        index: dict mapping character -> pygame.Rect inside surface
+        """
+        self.surface = surface
+        self.index = index
+    
+    @classmethod
+    def build(cls, characters, font_size, color):
+        """Rasterize characters into a new atlas using shelf packing"""
+        font = pygame.font.Font(None, font_size)
+        glyphs = [(char, font.render(char, True, color)) for char in characters]
+        
+        # Lay glyphs out left to right, starting a new shelf when a row is full
+        index = {}
+        x = y = shelf_height = width = 0
+        for char, glyph in glyphs:
+            glyph_width, glyph_height = glyph.get_size()
+            if x > 0 and x + glyph_width > ATLAS_MAX_WIDTH:
+                x = 0
+                y += shelf_height + ATLAS_PADDING
+                shelf_height = 0
+            index[char] = pygame.Rect(x, y, glyph_width, glyph_height)
+            x += glyph_width + ATLAS_PADDING
+            shelf_height = max(shelf_height, glyph_height)
+            width = max(width, x)
+        height = y + shelf_height
+        
+        surface = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+        for char, glyph in glyphs:
+            surface.blit(glyph, index[char])
+        return cls(surface, index)
+    
+    @classmethod
+    def load(cls, image_path, index_path):
+        """Load an atlas saved with save(); returns None if it is missing or unreadable"""
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            surface = pygame.image.load(image_path)
+        except (OSError, ValueError, pygame.error):
+            return None
+        if data.get('version') != ATLAS_VERSION:
+            return None
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        index = {char: pygame.Rect(rect) for char, rect in data['glyphs'].items()}
+        return cls(surface, index)
+    
+    def save(self, image_path, index_path):
+        """Write the atlas image and index; each file is replaced atomically"""
+        directory = os.path.dirname(image_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Keep the image extension on the temp file so pygame picks PNG
+        root, ext = os.path.splitext(image_path)
+        temp_image = f"{root}.tmp{ext}"
+        pygame.image.save(self.surface, temp_image)
+        os.replace(temp_image, image_path)
+        
+        temp_index = index_path + '.tmp'
+        data = {
+            'version': ATLAS_VERSION,
+            'glyphs': {char: list(rect) for char, rect in self.index.items()},
+        }
+        with open(temp_index, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_index, index_path)
+    
+    def has(self, char):
+        """Check if a character is in the atlas"""
+        return char in self.index
+    
+    def blit(self, screen, char, center):
+        """Draw a character centered at a position; returns False if it is not in the atlas"""
+        rect = self.index.get(char)
+        if rect is None:
+            return False
+        position = (center[0] - rect.width // 2, center[1] - rect.height // 2)
+        screen.blit(self.surface, position, rect)
+        return True
+
+
+def _cache_key(name, characters, font_size, color):
+    """Identify an atlas by its name, contents and how it was drawn"""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([ATLAS_VERSION, list(characters), font_size, list(color)],
+                             ensure_ascii=False).encode('utf-8'))
+    return f"atlas_{name}_{font_size}_{digest.hexdigest()[:12]}"
+
+
+def get_glyph_atlas(name, characters, font_size, color=None, size=None):
+    """
+    Get the atlas for a set of characters, building it on first use
+    name: label used in the cache file name (e.g. the language id)
+    size: screen (width, height) the atlas is drawn for, which picks its cache folder
+    Atlases are kept in memory and cached on disk with the other display-size
+    assets, so later runs load the image instead of rasterizing every glyph again.
+    """
+    color = tuple(color or config.COLOR_TEXT)
+    size = tuple(size) if size else (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+    key = _cache_key(name, characters, font_size, color)
+    if (size, key) in _atlases:
+        return _atlases[(size, key)]
+    
+    image_path = cache_path(size, key + '.png')
+    index_path = cache_path(size, key + '.json')
+    atlas = GlyphAtlas.load(image_path, index_path)
+    if atlas is None:
+        atlas = GlyphAtlas.build(characters, font_size, color)
+        try:
+            atlas.save(image_path, index_path)
+        except (OSError, pygame.error) as e:
+            print(f"Could not cache glyph atlas: {e}")
+    
+    _atlases[(size, key)] = atlas
+    return atlas
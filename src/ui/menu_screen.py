@@ -3,7 +3,13 @@ Menu Screen - Language and character selection
 """
 import pygame
 import config
-from src.ui.ui_components import Button, CharacterButton, GridLayout
+from src.layout import get_layout
+from src.languages import LANGUAGE_IDS, get_language_module
+from src.practice_scheduler import load_scheduler
+from src.sound_manager import get_sound_manager
+from src.ui.event_dispatcher import EventDispatcher
+from src.ui.ui_components import Button, CharacterButton, VirtualGrid, WidgetTree
+from src.ui.glyph_atlas import get_glyph_atlas
 
 
 class MenuScreen:
@@ -11,21 +17,22 @@ class MenuScreen:
     
     def __init__(self, screen):
         self.screen = screen
+        self.layout = get_layout(screen.get_size())
         self.current_language = None
         self.characters = []
-        self.character_buttons = []
+        self.character_atlas = None
+        self.character_grid = None
         self.language_buttons = []
         self.selected_character = None
-        self.current_page = 0  # For pagination
+        self.dispatcher = EventDispatcher()
+        self.grid_subscriptions = []  # Dispatcher tokens of the current character grid
+        self.widgets = WidgetTree()
+        self.needs_full_redraw = True  # Otherwise only changed widgets are drawn
+        self.prefetched = None  # (language, characters) whose pronunciations were last prefetched
         self._setup_language_buttons()
     
     def _setup_language_buttons(self):
         """Create language selection buttons"""
-        button_width = 100  # Reduced for smaller screen
-        button_height = config.BUTTON_HEIGHT
-        spacing = 8
-        start_y = 50  # Moved up for smaller screen
-        
         languages = [
             ('English', 'english'),
             ('Numbers', 'numbers'),
@@ -33,197 +40,141 @@ class MenuScreen:
             ('Chinese', 'chinese'),
         ]
         
-        total_width = len(languages) * button_width + (len(languages) - 1) * spacing
-        start_x = (config.SCREEN_WIDTH - total_width) // 2
-        
         self.language_buttons = []
-        for i, (label, lang_id) in enumerate(languages):
-            x = start_x + i * (button_width + spacing)
+        for rect, (label, lang_id) in zip(self.layout.language_buttons, languages):
             btn = Button(
-                x, start_y, button_width, button_height,
-                label, config.FONT_SIZE_SMALL,
+                *rect,
+                label, self.layout.font_small,
                 callback=lambda l=lang_id: self._select_language(l)
             )
             self.language_buttons.append(btn)
-        
-        # Pagination buttons (will be shown when characters are displayed)
-        self.prev_button = None
-        self.next_button = None
+            self.widgets.add(btn)
+            self.dispatcher.subscribe(btn.handle_event, (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN),
+                                      btn.rect)
     
     def _select_language(self, language_id):
         """Load characters for selected language"""
         self.current_language = language_id
+        self.needs_full_redraw = True
+        for btn, lang_id in zip(self.language_buttons, LANGUAGE_IDS):
+            btn.is_selected = lang_id == language_id
         
         # Import language module
-        if language_id == 'english':
-            from src.languages import english as lang_module
-        elif language_id == 'numbers':
-            from src.languages import numbers as lang_module
-        elif language_id == 'korean':
-            from src.languages import korean as lang_module
-        elif language_id == 'chinese':
-            from src.languages import chinese as lang_module
-        else:
+        lang_module = get_language_module(language_id)
+        if lang_module is None:
             return
         
-        # Get characters
+        # Get characters, rasterized once for the whole language
         self.characters = lang_module.get_all_characters()
+        self.character_atlas = get_glyph_atlas(
+            language_id, self.characters, self.layout.character_button_size - 20,
+            size=self.screen.get_size()
+        )
         self._setup_character_buttons()
+        # Read past attempts now so Next on the tracing screen never waits for them
+        load_scheduler(language_id)
     
     def _setup_character_buttons(self):
-        """Create character selection buttons in 2x2 grid with pagination"""
-        self.character_buttons = []
-        self.current_page = 0
+        """Create the scrollable character grid for the selected language"""
+        self.character_grid = None
+        for token in self.grid_subscriptions:
+            self.dispatcher.unsubscribe(token)
+        self.grid_subscriptions = []
         
         if not self.characters:
             return
         
-        # Calculate grid layout - 2x2 (4 characters per page)
-        cols = config.CHARACTER_GRID_COLS
-        rows = config.CHARACTER_GRID_ROWS
-        chars_per_page = cols * rows
-        button_size = config.CHARACTER_BUTTON_SIZE
-        spacing = 10
-        start_y = 140  # Adjusted for smaller screen
-        
-        # Calculate total pages
-        total_pages = (len(self.characters) + chars_per_page - 1) // chars_per_page
-        
-        # Get characters for current page
-        start_idx = self.current_page * chars_per_page
-        end_idx = min(start_idx + chars_per_page, len(self.characters))
-        page_characters = self.characters[start_idx:end_idx]
-        
-        # Calculate positions for 2x2 grid
-        total_width = cols * button_size + (cols - 1) * spacing
-        start_x = (config.SCREEN_WIDTH - total_width) // 2
-        
-        for i, char in enumerate(page_characters):
-            row = i // cols
-            col = i % cols
-            x = start_x + col * (button_size + spacing)
-            y = start_y + row * (button_size + spacing)
-            
-            btn = CharacterButton(
-                x, y, button_size, char, config.FONT_SIZE_MEDIUM,
-                callback=lambda c=char: self._select_character(c)
-            )
-            self.character_buttons.append(btn)
-        
-        # Setup pagination buttons
-        self._setup_pagination_buttons()
-    
-    def _setup_pagination_buttons(self):
-        """Create prev/next buttons for pagination"""
-        if not self.characters:
-            self.prev_button = None
-            self.next_button = None
-            return
-        
-        cols = config.CHARACTER_GRID_COLS
-        rows = config.CHARACTER_GRID_ROWS
-        chars_per_page = cols * rows
-        total_pages = (len(self.characters) + chars_per_page - 1) // chars_per_page
-        
-        button_width = 60
-        button_height = 30
-        button_y = config.SCREEN_HEIGHT - 40
-        
-        # Prev button
-        if self.current_page > 0:
-            self.prev_button = Button(
-                20, button_y, button_width, button_height,
-                "◀ Prev", config.FONT_SIZE_SMALL,
-                callback=lambda: self._prev_page()
-            )
-        else:
-            self.prev_button = None
-        
-        # Next button
-        if self.current_page < total_pages - 1:
-            self.next_button = Button(
-                config.SCREEN_WIDTH - button_width - 20, button_y, button_width, button_height,
-                "Next ▶", config.FONT_SIZE_SMALL,
-                callback=lambda: self._next_page()
-            )
-        else:
-            self.next_button = None
-    
-    def _prev_page(self):
-        """Go to previous page"""
-        if self.current_page > 0:
-            self.current_page -= 1
-            self._setup_character_buttons()
+        self.character_grid = VirtualGrid(
+            self.layout.character_grid, self.characters, self.layout.character_button_size,
+            cell_factory=self._create_character_button,
+            spacing=self.layout.character_grid_spacing,
+            cols=config.CHARACTER_GRID_COLS,
+            on_select=self._select_character
+        )
+        
+        # Taps start inside the grid; a drag keeps receiving motion and the
+        # release wherever the finger goes
+        self.grid_subscriptions = [
+            self.dispatcher.subscribe(self._handle_grid_event, (pygame.MOUSEBUTTONDOWN,),
+                                      self.character_grid.rect),
+            self.dispatcher.subscribe(self._handle_grid_event,
+                                      (pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL)),
+        ]
     
-    def _next_page(self):
-        """Go to next page"""
-        cols = config.CHARACTER_GRID_COLS
-        rows = config.CHARACTER_GRID_ROWS
-        chars_per_page = cols * rows
-        total_pages = (len(self.characters) + chars_per_page - 1) // chars_per_page
-        if self.current_page < total_pages - 1:
-            self.current_page += 1
-            self._setup_character_buttons()
+    def _create_character_button(self, char, x, y):
+        """Create a grid cell; the grid handles taps, so no callback is needed"""
+        return CharacterButton(
+            x, y, self.layout.character_button_size, char, self.layout.font_medium,
+            atlas=self.character_atlas
+        )
     
     def _select_character(self, character):
         """Select a character to practice"""
         self.selected_character = character
     
+    def _handle_grid_event(self, event):
+        """Pass an event to the character grid; returns the tracing action on a tap"""
+        if self.character_grid.handle_event(event) and self.selected_character:
+            return {
+                'action': 'start_tracing',
+                'language': self.current_language,
+                'character': self.selected_character
+            }
+        return None
+    
     def handle_event(self, event):
         """Handle input events"""
-        # Handle language buttons
-        for btn in self.language_buttons:
-            if btn.handle_event(event):
-                return None
-        
-        # Handle pagination buttons
-        if self.prev_button and self.prev_button.handle_event(event):
-            return None
-        if self.next_button and self.next_button.handle_event(event):
-            return None
-        
-        # Handle character buttons
-        for btn in self.character_buttons:
-            if btn.handle_event(event):
-                if self.selected_character:
-                    return {
-                        'action': 'start_tracing',
-                        'language': self.current_language,
-                        'character': self.selected_character
-                    }
-        
+        # Language buttons and the character grid only see events meant for them
+        action = self.dispatcher.dispatch(event)
+        if isinstance(action, dict):
+            return action
         return None
     
     def update(self, dt=0):
         """Update screen state"""
-        pass
+        if self.character_grid:
+            self.character_grid.update(dt)
+            # Decode the pronunciations of the page on screen before one is tapped
+            visible = (self.current_language,
+                       tuple(cell.character for _, cell in sorted(self.character_grid.cells.items())))
+            if visible != self.prefetched:
+                self.prefetched = visible
+                get_sound_manager().prefetch_pronunciations(*visible)
     
     def render(self):
         """Render the menu screen"""
+        # The screen keeps its contents between frames, so after the first
+        # frame only widgets whose look changed are drawn again
+        if not self.needs_full_redraw:
+            self.widgets.draw_dirty(self.screen)
+            if self.character_grid and self.character_grid.is_dirty():
+                self.character_grid.draw(self.screen)
+            return
+        self.needs_full_redraw = False
+        
         # Clear screen
         self.screen.fill(config.COLOR_BACKGROUND)
         
         # Title (smaller for 3.5" screen)
-        title_font = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
+        title_font = pygame.font.Font(None, self.layout.font_medium)
         title_text = title_font.render("Learning App", True, config.COLOR_TEXT)
-        title_rect = title_text.get_rect(center=(config.SCREEN_WIDTH // 2, 20))
+        title_rect = title_text.get_rect(center=self.layout.menu_title_center)
         self.screen.blit(title_text, title_rect)
         
         # Language selection label
         if not self.current_language:
-            label_font = pygame.font.Font(None, config.FONT_SIZE_SMALL)
+            label_font = pygame.font.Font(None, self.layout.font_small)
             label_text = label_font.render("Select Language:", True, config.COLOR_TEXT)
-            label_rect = label_text.get_rect(center=(config.SCREEN_WIDTH // 2, 35))
+            label_rect = label_text.get_rect(center=self.layout.menu_prompt_center)
             self.screen.blit(label_text, label_rect)
         
-        # Draw language buttons
-        for btn in self.language_buttons:
-            btn.draw(self.screen)
+        # Draw language buttons (the selected one has a highlighted border)
+        self.widgets.draw(self.screen)
         
         # Draw character buttons
         if self.current_language:
             # Show language label (compact)
-            lang_label_font = pygame.font.Font(None, config.FONT_SIZE_SMALL)
+            lang_label_font = pygame.font.Font(None, self.layout.font_small)
             lang_names = {
                 'english': 'English',
                 'numbers': 'Numbers',
@@ -231,31 +182,12 @@ class MenuScreen:
                 'chinese': 'Chinese'
             }
             lang_label = lang_names.get(self.current_language, '')
+            count_info = f"{lang_label} ({len(self.characters)})"
             
-            # Calculate page info
-            cols = config.CHARACTER_GRID_COLS
-            rows = config.CHARACTER_GRID_ROWS
-            chars_per_page = cols * rows
-            total_pages = (len(self.characters) + chars_per_page - 1) // chars_per_page
-            page_info = f"{lang_label} ({self.current_page + 1}/{total_pages})"
-            
-            lang_text = lang_label_font.render(page_info, True, config.COLOR_TEXT)
-            lang_rect = lang_text.get_rect(center=(config.SCREEN_WIDTH // 2, 120))
+            lang_text = lang_label_font.render(count_info, True, config.COLOR_TEXT)
+            lang_rect = lang_text.get_rect(center=self.layout.language_label_center)
             self.screen.blit(lang_text, lang_rect)
             
-            # Draw character buttons
-            for btn in self.character_buttons:
-                btn.draw(self.screen)
-            
-            # Draw pagination buttons
-            if self.prev_button:
-                self.prev_button.draw(self.screen)
-            if self.next_button:
-                self.next_button.draw(self.screen)
-        
-        # Highlight selected language button
-        if self.current_language:
-            lang_index = ['english', 'numbers', 'korean', 'chinese'].index(self.current_language)
-            if 0 <= lang_index < len(self.language_buttons):
-                btn = self.language_buttons[lang_index]
-                pygame.draw.rect(self.screen, config.COLOR_SUCCESS, btn.rect, 3)
+            # Draw character grid
+            if self.character_grid:
+                self.character_grid.draw(self.screen)
@@ -1,10 +1,28 @@
 """
 Tracing Screen - Character tracing interface
 """
+import time
 import pygame
 import config
-from src.tracing_engine import TracingEngine
-from src.ui.ui_components import Button
+from src.layout import get_layout
+from src.languages import get_language_module
+from src.asset_cache import load_engine
+from src.progress_store import get_progress_store
+from src.practice_scheduler import get_scheduler, load_scheduler, record_practice
+from src.sound_manager import get_sound_manager
+from src.stroke_animation import StrokeAnimation
+from src.stroke_archive import get_stroke_archive
+from src.stroke_matcher import STROKE_CORRECT, STROKE_REVERSED, STROKE_OUT_OF_ORDER
+from src.ui.effects import EffectsEngine
+from src.ui.event_dispatcher import EventDispatcher
+from src.ui.ui_components import Button, WidgetTree
+
+
+# Hints shown after a stroke drawn the wrong way
+STROKE_HINTS = {
+    STROKE_REVERSED: "Try starting from the other end",
+    STROKE_OUT_OF_ORDER: "Try a different stroke first",
+}
 
 
 class TracingScreen:
@@ -12,84 +30,149 @@ class TracingScreen:
     
     def __init__(self, screen, language, character):
         self.screen = screen
+        self.layout = get_layout(screen.get_size())
         self.language = language
         self.character = character
         self.character_data = None
         self.tracing_engine = None
         self.buttons = []
-        self.completion_animation_time = 0
+        self.dispatcher = EventDispatcher()
+        self.effects = EffectsEngine(self.layout)
         self.show_completion = False
+        self.completion_check_pending = False  # A stroke ended; check completion once it is scored
         self.pending_action = None
+        self.demo = None  # StrokeAnimation while "Show me" is playing
+        self.demo_hold = 0  # Seconds the finished demonstration has been shown
+        self.attempt_start = None  # time.monotonic() of the first point of the current attempt
+        self.attempt_strokes = []  # Points of the current attempt as (x, y, ms), one list per stroke
+        self.stroke_open = False  # The last point in attempt_strokes belongs to an unfinished stroke
         
         self._load_character_data()
         self._setup_buttons()
+        load_scheduler(language)
+        get_sound_manager().play_pronunciation(language, character)
     
     def _load_character_data(self):
         """Load character data from language module"""
         # Import language module
-        if self.language == 'english':
-            from src.languages import english as lang_module
-        elif self.language == 'numbers':
-            from src.languages import numbers as lang_module
-        elif self.language == 'korean':
-            from src.languages import korean as lang_module
-        elif self.language == 'chinese':
-            from src.languages import chinese as lang_module
-        else:
+        lang_module = get_language_module(self.language)
+        if lang_module is None:
             return
         
-        # Get character data
+        # Get character data; fitted strokes and guide layer come from the asset cache
         self.character_data = lang_module.get_character(self.character)
         
         if self.character_data:
-            self.tracing_engine = TracingEngine(self.screen, self.character_data)
+            self.tracing_engine = load_engine(self.screen, self.language, lang_module, self.character)
     
     def _setup_buttons(self):
         """Create navigation and control buttons"""
-        button_width = 80  # Reduced for smaller screen
-        button_height = 30  # Reduced height
-        button_y = config.SCREEN_HEIGHT - 35
-        spacing = 5
-        
-        # Calculate total width and center
-        total_width = 3 * button_width + 2 * spacing
-        start_x = (config.SCREEN_WIDTH - total_width) // 2
+        back_rect, show_rect, clear_rect, next_rect = self.layout.control_buttons
+        font_size = self.layout.font_caption
         
         # Back button
         self.back_button = Button(
-            start_x, button_y, button_width, button_height,
-            "Back", config.FONT_SIZE_SMALL - 4,
+            *back_rect,
+            "Back", font_size,
             callback=lambda: self._on_back()
         )
         
+        # Show me button (animated stroke order)
+        self.show_button = Button(
+            *show_rect,
+            "Show me", font_size,
+            callback=lambda: self._on_show_me()
+        )
+        
         # Clear button
         self.clear_button = Button(
-            start_x + button_width + spacing, button_y, button_width, button_height,
-            "Clear", config.FONT_SIZE_SMALL - 4,
+            *clear_rect,
+            "Clear", font_size,
             callback=lambda: self._on_clear()
         )
         
         # Next button
         self.next_button = Button(
-            start_x + 2 * (button_width + spacing), button_y, button_width, button_height,
-            "Next", config.FONT_SIZE_SMALL - 4,
+            *next_rect,
+            "Next", font_size,
             callback=lambda: self._on_next()
         )
         
-        self.buttons = [self.back_button, self.clear_button, self.next_button]
+        self.buttons = [self.back_button, self.show_button, self.clear_button, self.next_button]
+        self.widgets = WidgetTree(self.buttons)
+        for btn in self.buttons:
+            self.dispatcher.subscribe(btn.handle_event, (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN),
+                                      btn.rect)
+    
+    def _record_attempt(self):
+        """Save the current attempt to the progress store (once per attempt)"""
+        if self.attempt_start is None or not self.tracing_engine:
+            return
+        completion, is_complete = self.tracing_engine.get_completion()
+        shape_score = self.tracing_engine.get_shape_score()
+        duration = time.monotonic() - self.attempt_start
+        attempt = get_progress_store().record_attempt(
+            self.language, self.character, completion, shape_score,
+            is_complete, duration, len(self.tracing_engine.user_path)
+        )
+        record_practice(attempt)
+        archive = get_stroke_archive()
+        if archive and self.attempt_strokes:
+            try:
+                archive.append(self.language, self.character, self.attempt_strokes)
+            except OSError as e:
+                print(f"Could not archive strokes: {e}")
+        self.attempt_start = None
+        self.attempt_strokes = []
+        self.stroke_open = False
     
     def _on_back(self):
         """Return to menu"""
+        self._record_attempt()
         self.pending_action = 'back_to_menu'
     
+    def _on_show_me(self):
+        """Animate the guide strokes in writing order"""
+        if not self.tracing_engine:
+            return
+        self.demo = StrokeAnimation(
+            self.tracing_engine.scaled_guide_paths,
+            self.layout.px(config.DEMO_STROKE_SPEED), config.DEMO_STROKE_PAUSE,
+            config.COLOR_DEMO_STROKE, self.layout.px(config.DEMO_LINE_WIDTH)
+        )
+        self.demo_hold = 0
+    
     def _on_clear(self):
         """Clear current drawing"""
+        self._record_attempt()
         if self.tracing_engine:
             self.tracing_engine.clear_user_path()
     
     def _on_next(self):
-        """Go to next character (for now, just go back to menu)"""
-        self.pending_action = 'back_to_menu'
+        """Go to the character the practice scheduler picks next"""
+        self._record_attempt()
+        scheduler = get_scheduler(self.language)
+        if scheduler:
+            character = scheduler.next_character(exclude=self.character)
+        else:
+            # Past attempts are still being read; take the next character in the pack
+            character = self._next_in_pack()
+        if character is None:
+            self.pending_action = 'back_to_menu'
+        else:
+            self.pending_action = {
+                'action': 'start_tracing',
+                'language': self.language,
+                'character': character
+            }
+    
+    def _next_in_pack(self):
+        """Character after the current one in pack order (wrapping), or None"""
+        lang_module = get_language_module(self.language)
+        characters = lang_module.get_all_characters() if lang_module else []
+        if self.character not in characters:
+            return characters[0] if characters else None
+        return characters[(characters.index(self.character) + 1) % len(characters)]
     
     def handle_touch(self, touch_data):
         """Handle touch input for drawing"""
@@ -102,45 +185,66 @@ class TracingScreen:
                 touch_x, touch_y = touch_data['position']
                 
                 # Check if touching a button
-                touching_button = False
-                for btn in self.buttons:
-                    if btn.is_clicked((touch_x, touch_y)):
-                        touching_button = True
-                        break
-                
-                if not touching_button:
+                if not self.dispatcher.hit_test((touch_x, touch_y)):
+                    # Drawing takes over from the demonstration
+                    self.demo = None
+                    
                     # Add point to tracing engine
+                    # An attempt starts on an empty canvas and ends when it is
+                    # completed, cleared or left
+                    if self.attempt_start is None and not self.tracing_engine.user_path:
+                        self.attempt_start = time.monotonic()
+                    if self.attempt_start is not None:
+                        if not self.stroke_open:
+                            self.attempt_strokes.append([])
+                            self.stroke_open = True
+                        self.attempt_strokes[-1].append(
+                            (touch_x, touch_y, touch_data.get('time', pygame.time.get_ticks())))
                     self.tracing_engine.add_user_point(touch_x, touch_y)
         else:
-            # Touch released - validate final path
-            if touch_data['path']:
-                self.tracing_engine.set_user_path(touch_data['path'])
+            # Touch released - finish the stroke and validate it
+            self.stroke_open = False
+            if touch_data['stroke_ended']:
+                self.tracing_engine.end_stroke()
                 
-                # Check if completed
-                completion, is_complete = self.tracing_engine.get_completion()
-                if is_complete and not self.show_completion:
-                    self.show_completion = True
-                    self.completion_animation_time = 0
+                # Check if completed (in update, once the score is published)
+                self.completion_check_pending = True
     
     def handle_event(self, event):
         """Handle pygame events"""
-        # Handle button clicks
-        for btn in self.buttons:
-            if btn.handle_event(event):
-                if self.pending_action:
-                    action = self.pending_action
-                    self.pending_action = None
-                    return action
+        # Handle button clicks (only the button under the pointer sees them)
+        if self.dispatcher.dispatch(event) and self.pending_action:
+            action = self.pending_action
+            self.pending_action = None
+            return action
         
         return None
     
     def update(self, dt):
         """Update screen state"""
+        if self.tracing_engine:
+            self.tracing_engine.update()
+            if self.completion_check_pending and not self.tracing_engine.is_scoring_pending():
+                self.completion_check_pending = False
+                completion, is_complete = self.tracing_engine.get_completion()
+                if is_complete and not self.show_completion:
+                    self.show_completion = True
+                    self.effects.celebrate()
+                    self._record_attempt()
+                    get_sound_manager().play_celebration()
+                elif self.tracing_engine.get_last_stroke_feedback() == STROKE_CORRECT:
+                    get_sound_manager().play_stroke_correct()
+        
+        if self.demo:
+            self.demo.update(dt)
+            if self.demo.is_finished():
+                self.demo_hold += dt
+                if self.demo_hold >= config.DEMO_HOLD:
+                    self.demo = None
+        
         if self.show_completion:
-            self.completion_animation_time += dt
-            if self.completion_animation_time >= config.CELEBRATION_DURATION:
-                self.show_completion = False
-                self.completion_animation_time = 0
+            self.effects.update(dt)
+            self.show_completion = self.effects.is_active()
     
     def render(self):
         """Render the tracing screen"""
@@ -149,46 +253,46 @@ class TracingScreen:
         
         if not self.tracing_engine:
             # Error state
-            error_font = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
+            error_font = pygame.font.Font(None, self.layout.font_medium)
             error_text = error_font.render("Character not found", True, config.COLOR_ERROR)
-            error_rect = error_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2))
+            error_rect = error_text.get_rect(center=self.layout.screen_center)
             self.screen.blit(error_text, error_rect)
             return
         
         # Draw character name at top (smaller for 3.5" screen)
-        name_font = pygame.font.Font(None, config.FONT_SIZE_MEDIUM)
+        name_font = pygame.font.Font(None, self.layout.font_medium)
         name_text = name_font.render(self.character, True, config.COLOR_TEXT)
-        name_rect = name_text.get_rect(center=(config.SCREEN_WIDTH // 2, 15))
+        name_rect = name_text.get_rect(center=self.layout.character_name_center)
         self.screen.blit(name_text, name_rect)
         
         # Draw pronunciation hint (smaller)
         if self.character_data and 'pronunciation' in self.character_data:
-            pron_font = pygame.font.Font(None, config.FONT_SIZE_SMALL - 4)
+            pron_font = pygame.font.Font(None, self.layout.font_caption)
             pron_text = pron_font.render(f"({self.character_data['pronunciation']})", True, config.COLOR_TEXT)
-            pron_rect = pron_text.get_rect(center=(config.SCREEN_WIDTH // 2, 30))
+            pron_rect = pron_text.get_rect(center=self.layout.pronunciation_center)
             self.screen.blit(pron_text, pron_rect)
         
         # Render tracing engine (guide lines and user drawing)
         self.tracing_engine.render()
         
-        # Draw completion celebration
+        # Stroke order demonstration, on top of the guide
+        if self.demo:
+            self.demo.render(self.screen)
+        
+        # Stroke order / direction hint for the last finished stroke
+        hint = STROKE_HINTS.get(self.tracing_engine.get_last_stroke_feedback())
+        if hint:
+            hint_font = pygame.font.Font(None, self.layout.font_caption)
+            hint_text = hint_font.render(hint, True, config.COLOR_ERROR)
+            hint_rect = hint_text.get_rect(center=self.layout.stroke_hint_center)
+            self.screen.blit(hint_text, hint_rect)
+        
+        # Draw completion celebration (banner and particles, pre-rendered)
         if self.show_completion:
-            # Fade effect (start at full opacity, fade out)
-            progress = min(self.completion_animation_time / config.CELEBRATION_DURATION, 1.0)
-            alpha = int(255 * (1 - progress))
-            
-            # Celebration text with fade
-            celebration_font = pygame.font.Font(None, 96)
-            celebration_text = celebration_font.render("Great Job!", True, config.COLOR_SUCCESS)
-            celebration_rect = celebration_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2))
-            
-            # Apply alpha to the text surface
-            celebration_text.set_alpha(alpha)
-            self.screen.blit(celebration_text, celebration_rect)
-        
-        # Draw buttons
-        for btn in self.buttons:
-            btn.draw(self.screen)
+            self.effects.draw(self.screen)
+        
+        # Draw buttons (each blits its cached surface)
+        self.widgets.draw(self.screen)
         
         # Draw instructions (removed for smaller screen to save space)
         # Instructions are clear from the interface
@@ -1,21 +1,107 @@
 """
 Reusable UI Components
 """
+import math
+from abc import ABC, abstractmethod
 import pygame
 import config
 
 
-class Button:
+class Widget(ABC):
+    """
+    Retained-mode widget that caches its rendered surface for each visual state
+    Subclasses implement visual_state() and render_state(state). draw() blits
+    the cached surface, so a widget is only rendered again for a state it has
+    not drawn before, after invalidate(), or when its size changes.
+    """
+    
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self._surfaces = {}  # Visual state -> rendered surface
+        self._surface_size = self.rect.size
+        self._drawn_state = None  # Visual state and position at the last draw
+        self._drawn_rect = None
+        self._invalid = True
+    
+    def visual_state(self):
+        """Hashable value that changes whenever the widget should look different"""
+        return None
+    
+    @abstractmethod
+    def render_state(self, state):
+        """Render the widget in a visual state onto a new surface of its size"""
+    
+    def invalidate(self):
+        """Forget cached surfaces (call when the content, e.g. the text, changes)"""
+        self._surfaces.clear()
+        self._invalid = True
+    
+    def is_dirty(self):
+        """Check whether the widget looks different from when it was last drawn"""
+        return (self._invalid or self.visual_state() != self._drawn_state or
+                self.rect != self._drawn_rect)
+    
+    def draw(self, screen):
+        """Draw the widget from its cached surface"""
+        if self.rect.size != self._surface_size:
+            self._surfaces.clear()
+            self._surface_size = self.rect.size
+        state = self.visual_state()
+        surface = self._surfaces.get(state)
+        if surface is None:
+            surface = self.render_state(state)
+            self._surfaces[state] = surface
+        screen.blit(surface, self.rect)
+        self._drawn_state = state
+        self._drawn_rect = self.rect.copy()
+        self._invalid = False
+
+
+class WidgetTree:
+    """
+    Widgets drawn together onto a surface that keeps its contents between frames
+    Widgets must not overlap; a widget that moves leaves its old area for the
+    owner to repaint.
+    """
+    
+    def __init__(self, widgets=None):
+        self.widgets = list(widgets or [])
+    
+    def add(self, widget):
+        """Add a widget and return it"""
+        self.widgets.append(widget)
+        return widget
+    
+    def draw(self, screen):
+        """Draw every widget (after the screen was cleared)"""
+        for widget in self.widgets:
+            widget.draw(screen)
+    
+    def draw_dirty(self, screen):
+        """
+        Draw only the widgets that changed since they were last drawn
+        Returns: list of screen rects that were redrawn
+        """
+        rects = []
+        for widget in self.widgets:
+            if widget.is_dirty():
+                widget.draw(screen)
+                rects.append(widget.rect.copy())
+        return rects
+
+
+class Button(Widget):
     """Simple button component"""
     
     def __init__(self, x, y, width, height, text, font_size=None, callback=None):
-        self.rect = pygame.Rect(x, y, width, height)
+        super().__init__((x, y, width, height))
         self.text = text
         self.callback = callback
         self.is_hovered = False
+        self.is_selected = False  # Drawn with a highlighted border
         self.font_size = font_size or config.FONT_SIZE_MEDIUM
         self.font = pygame.font.Font(None, self.font_size)
-        
+    
     def handle_event(self, event):
         """Handle mouse/touch events"""
         if event.type == pygame.MOUSEMOTION:
@@ -27,19 +113,35 @@ class Button:
                 return True
         return False
     
-    def draw(self, screen):
+    def set_text(self, text):
+        """Change the label"""
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+    
+    def visual_state(self):
+        """Buttons change look when hovered or selected"""
+        return (self.is_hovered, self.is_selected)
+    
+    def render_state(self, state):
         """Draw the button"""
+        is_hovered, is_selected = state
+        surface = pygame.Surface(self.rect.size)
+        local_rect = surface.get_rect()
+        
         # Button color based on hover state
-        color = config.COLOR_BUTTON_HOVER if self.is_hovered else config.COLOR_BUTTON
+        color = config.COLOR_BUTTON_HOVER if is_hovered else config.COLOR_BUTTON
         
         # Draw button
-        pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, config.COLOR_TEXT, self.rect, 3)
+        surface.fill(color)
+        border_color = config.COLOR_SUCCESS if is_selected else config.COLOR_TEXT
+        pygame.draw.rect(surface, border_color, local_rect, 3)
         
         # Draw text
         text_surface = self.font.render(self.text, True, config.COLOR_TEXT)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        text_rect = text_surface.get_rect(center=local_rect.center)
+        surface.blit(text_surface, text_rect)
+        return surface
     
     def is_clicked(self, pos):
         """Check if button is clicked at position"""
@@ -49,40 +151,209 @@ class Button:
 class CharacterButton(Button):
     """Button for character selection"""
     
-    def __init__(self, x, y, size, character, font_size=None, callback=None):
+    def __init__(self, x, y, size, character, font_size=None, callback=None, atlas=None):
         super().__init__(x, y, size, size, character, font_size, callback)
         self.character = character
         self.size = size
-        
-    def draw(self, screen):
+        self.atlas = atlas  # GlyphAtlas holding this character, if one was built
+        self.char_font = None
+    
+    def bind(self, character):
+        """Reuse this button for another character"""
+        self.character = character
+        self.text = character
+        self.is_hovered = False
+        self.invalidate()
+    
+    def render_state(self, state):
         """Draw character button with larger character display"""
+        is_hovered, _ = state
+        surface = pygame.Surface(self.rect.size)
+        local_rect = surface.get_rect()
+        
         # Button background
-        color = config.COLOR_BUTTON_HOVER if self.is_hovered else config.COLOR_BUTTON
-        pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, config.COLOR_TEXT, self.rect, 2)
+        color = config.COLOR_BUTTON_HOVER if is_hovered else config.COLOR_BUTTON
+        surface.fill(color)
+        pygame.draw.rect(surface, config.COLOR_TEXT, local_rect, 2)
         
-        # Draw character (larger)
-        char_font = pygame.font.Font(None, self.size - 20)
-        char_surface = char_font.render(self.character, True, config.COLOR_TEXT)
-        char_rect = char_surface.get_rect(center=self.rect.center)
-        screen.blit(char_surface, char_rect)
+        # Draw character (larger), from the pre-rendered atlas when available
+        if self.atlas and self.atlas.blit(surface, self.character, local_rect.center):
+            return surface
+        if self.char_font is None:
+            self.char_font = pygame.font.Font(None, self.size - 20)
+        char_surface = self.char_font.render(self.character, True, config.COLOR_TEXT)
+        char_rect = char_surface.get_rect(center=local_rect.center)
+        surface.blit(char_surface, char_rect)
+        return surface
 
 
-class GridLayout:
-    """Helper for grid layouts"""
-    
-    @staticmethod
-    def calculate_grid(items, cols, screen_width, start_y, item_width, item_height, spacing=10):
-        """Calculate positions for grid layout"""
-        positions = []
-        total_width = cols * item_width + (cols - 1) * spacing
-        start_x = (screen_width - total_width) // 2
+class VirtualGrid:
+    """
+    Scrollable grid that only keeps widgets for the cells currently visible
+    Cells scrolled out of view are recycled for the ones scrolling in, so the
+    cost of a frame depends on the viewport size, not on the number of items.
+    """
+    
+    def __init__(self, rect, items, cell_size, cell_factory, spacing=10, cols=None, on_select=None):
+        """
+        rect: viewport (x, y, width, height)
+        items: list of items, one per cell
+        cell_factory: callable(item, x, y) creating a widget with rect, is_hovered,
+                      draw(screen), is_dirty() and bind(item)
+        cols: number of columns (None to fit as many as the width allows)
+        on_select: callable(item) run when a cell is tapped
+        """
+        self.rect = pygame.Rect(rect)
+        self.items = items
+        self.cell_size = cell_size
+        self.cell_factory = cell_factory
+        self.spacing = spacing
+        self.on_select = on_select
+        
+        pitch = cell_size + spacing
+        self.cols = cols or max(1, (self.rect.width + spacing) // pitch)
+        self.pitch = pitch
+        total_width = self.cols * cell_size + (self.cols - 1) * spacing
+        self.start_x = self.rect.x + (self.rect.width - total_width) // 2
+        rows = (len(items) + self.cols - 1) // self.cols
+        content_height = rows * pitch - spacing if rows else 0
+        self.max_scroll = max(0, content_height - self.rect.height)
+        
+        self.scroll = 0.0
+        self.velocity = 0.0  # Pixels per second, positive scrolls down the list
+        self.dragging = False
+        self.drag_moved = False
+        self.drag_start_y = 0
+        self.last_drag_y = 0
+        self.last_drag_time = 0
+        
+        self.cells = {}  # Item index -> widget for visible cells
+        self.free_cells = []  # Widgets waiting to be reused
+        self._dirty = True  # Scrolled since the last draw
+        self._sync_cells()
+    
+    def _visible_range(self):
+        """Indices of items whose row intersects the viewport"""
+        first_row = int(self.scroll // self.pitch)
+        last_row = int((self.scroll + self.rect.height) // self.pitch)
+        first = first_row * self.cols
+        last = min(len(self.items), (last_row + 1) * self.cols)
+        return range(first, last)
+    
+    def _cell_position(self, index):
+        """Screen position of a cell at the current scroll offset"""
+        row, col = divmod(index, self.cols)
+        x = self.start_x + col * self.pitch
+        y = self.rect.y + row * self.pitch - int(round(self.scroll))
+        return x, y
+    
+    def _sync_cells(self):
+        """Recycle cells that left the viewport and position the visible ones"""
+        visible = self._visible_range()
+        for index in [i for i in self.cells if i not in visible]:
+            self.free_cells.append(self.cells.pop(index))
         
-        for i, item in enumerate(items):
-            row = i // cols
-            col = i % cols
-            x = start_x + col * (item_width + spacing)
-            y = start_y + row * (item_height + spacing)
-            positions.append((x, y))
+        for index in visible:
+            x, y = self._cell_position(index)
+            cell = self.cells.get(index)
+            if cell is None:
+                if self.free_cells:
+                    cell = self.free_cells.pop()
+                    cell.bind(self.items[index])
+                else:
+                    cell = self.cell_factory(self.items[index], x, y)
+                self.cells[index] = cell
+            cell.rect.topleft = (x, y)
+    
+    def scroll_to(self, offset):
+        """Move to a scroll offset, clamped to the content"""
+        clamped = min(max(offset, 0.0), float(self.max_scroll))
+        if clamped != offset:
+            self.velocity = 0.0
+        if clamped != self.scroll:
+            self.scroll = clamped
+            self._dirty = True
+            self._sync_cells()
+    
+    def cell_at(self, pos):
+        """Get (index, cell) under a screen position, or (None, None)"""
+        if not self.rect.collidepoint(pos):
+            return None, None
+        for index, cell in self.cells.items():
+            if cell.rect.collidepoint(pos):
+                return index, cell
+        return None, None
+    
+    def handle_event(self, event):
+        """
+        Handle drag scrolling and taps
+        Returns: True if a cell was tapped
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.rect.collidepoint(event.pos):
+                self.dragging = True
+                self.drag_moved = False
+                self.velocity = 0.0
+                self.drag_start_y = self.last_drag_y = event.pos[1]
+                self.last_drag_time = pygame.time.get_ticks()
+        
+        elif event.type == pygame.MOUSEMOTION:
+            if self.dragging:
+                y = event.pos[1]
+                if abs(y - self.drag_start_y) >= config.SCROLL_DRAG_THRESHOLD:
+                    self.drag_moved = True
+                if self.drag_moved:
+                    now = pygame.time.get_ticks()
+                    delta = self.last_drag_y - y
+                    elapsed = max(now - self.last_drag_time, 1) / 1000.0
+                    # Smooth the release velocity over the last few motion events
+                    self.velocity = 0.8 * (delta / elapsed) + 0.2 * self.velocity
+                    self.scroll_to(self.scroll + delta)
+                    self.last_drag_y = y
+                    self.last_drag_time = now
+            for index, cell in self.cells.items():
+                cell.is_hovered = not self.drag_moved and cell.rect.collidepoint(event.pos)
+        
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            if self.dragging:
+                self.dragging = False
+                if self.drag_moved:
+                    # A pause before release means the finger stopped; no fling
+                    if pygame.time.get_ticks() - self.last_drag_time > 100:
+                        self.velocity = 0.0
+                    return False
+                index, cell = self.cell_at(event.pos)
+                if cell is not None:
+                    if self.on_select:
+                        self.on_select(self.items[index])
+                    return True
         
-        return positions
+        elif event.type == pygame.MOUSEWHEEL:
+            if self.rect.collidepoint(pygame.mouse.get_pos()):
+                self.velocity = 0.0
+                self.scroll_to(self.scroll - event.y * self.pitch / 2)
+        
+        return False
+    
+    def update(self, dt):
+        """Advance kinetic scrolling"""
+        if self.dragging or self.velocity == 0.0:
+            return
+        self.scroll_to(self.scroll + self.velocity * dt)
+        self.velocity *= math.exp(-config.SCROLL_FRICTION * dt)
+        if abs(self.velocity) < config.SCROLL_MIN_VELOCITY:
+            self.velocity = 0.0
+    
+    def is_dirty(self):
+        """Check whether the grid scrolled or a visible cell changed since the last draw"""
+        return self._dirty or any(cell.is_dirty() for cell in self.cells.values())
+    
+    def draw(self, screen):
+        """Draw the viewport background and the visible cells, clipped to the viewport"""
+        previous_clip = screen.get_clip()
+        screen.set_clip(self.rect.clip(previous_clip))
+        screen.fill(config.COLOR_BACKGROUND, self.rect)
+        for cell in self.cells.values():
+            cell.draw(screen)
+        screen.set_clip(previous_clip)
+        self._dirty = False